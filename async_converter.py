@@ -0,0 +1,158 @@
+# docling-page-wise-pdf-converter/async_converter.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from .pdf_converter import ConversionCancelled, PdfConverter
+
+DEFAULT_BATCH_PAGES = 20  # Pages per docling call, so that cancellation and iter_pages need not wait for the whole PDF
+
+
+class AsyncPdfConverter:
+    """
+    Runs PDF conversions from asyncio code on a managed thread pool.
+
+    At most max_concurrency conversions run at a time; further jobs wait without occupying a worker.
+    A local PDF is converted by docling in calls of batch_pages pages (None for one call per OCR route).
+    Cancelling the awaiting task stops its conversion at the next page or format boundary, or after docling's
+    current batch of pages; a URL is only checked before and after docling converts it.
+    Keyword arguments of the conversion methods are passed on to PdfConverter
+    (e.g. ocr_routing, dedup_pages, or batch_pages for a single conversion).
+    """
+    def __init__(self, max_concurrency: int = 2, batch_pages: Optional[int] = DEFAULT_BATCH_PAGES):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.batch_pages = batch_pages
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pdf-converter")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the concurrency semaphore for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, job, cancel_event: threading.Event):
+        """
+        Runs a blocking job on the executor, turning task cancellation into a cancel event.
+        """
+        async with self._get_semaphore():
+            future = asyncio.get_running_loop().run_in_executor(self._executor, job)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                cancel_event.set()
+                # Keep the concurrency slot until the worker thread has actually stopped
+                try:
+                    await future
+                except Exception:
+                    pass
+                raise
+
+    @staticmethod
+    def _convert(source: str, output_dir: str, output_format: str, **kwargs):
+        converter = PdfConverter(source, output_dir, **kwargs)
+        if output_format == "all":
+            converter.convert_all()
+        else:
+            converter.convert_to_format(output_format)
+
+    async def convert(self, source: str, output_dir: str, output_format: str = "all", **kwargs):
+        """
+        Converts a PDF like convert_pdf without blocking the event loop.
+        """
+        cancel_event = threading.Event()
+        kwargs.setdefault("batch_pages", self.batch_pages)
+        await self._run(lambda: self._convert(source, output_dir, output_format, cancel_event=cancel_event, **kwargs),
+                        cancel_event)
+
+    async def iter_pages(self, source: str, output_dir: str, output_format: str = "all",
+                         **kwargs) -> AsyncIterator[Tuple[str, int, Any]]:
+        """
+        Converts a PDF and yields (format_name, page_number, content) for each page as soon as it is finished.
+        Leaving the iteration early cancels the rest of the conversion.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        finished = object()
+        cancel_event = threading.Event()
+        kwargs.setdefault("batch_pages", self.batch_pages)
+
+        def on_page(format_name: str, page_number: int, content):
+            loop.call_soon_threadsafe(queue.put_nowait, (format_name, page_number, content))
+
+        task = asyncio.ensure_future(self._run(
+            lambda: self._convert(source, output_dir, output_format, cancel_event=cancel_event, on_page=on_page, **kwargs),
+            cancel_event))
+        # Pages are queued from the worker thread before the job completes, so this always comes last
+        task.add_done_callback(lambda _: queue.put_nowait(finished))
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                yield item
+            await task  # Re-raise any conversion error
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, ConversionCancelled):
+                    pass
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts down the executor. Running conversions finish unless their tasks were cancelled.
+        """
+        self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+
+_default_converter: Optional[AsyncPdfConverter] = None
+
+
+def _get_default_converter() -> AsyncPdfConverter:
+    global _default_converter
+    if _default_converter is None:
+        _default_converter = AsyncPdfConverter()
+    return _default_converter
+
+
+async def convert_pdf_async(source: str, output_dir: str, output_format: str = "all", **kwargs):
+    """
+    Converts PDF to multiple formats without blocking the event loop.
+    Uses a shared AsyncPdfConverter; create your own to choose the concurrency limit.
+    Args:
+        source: Path to the input PDF file or URL
+        output_dir: Directory for output files
+        output_format: The desired output format (see convert_pdf). Defaults to "all".
+        **kwargs: Further PdfConverter options (e.g. ocr_routing, dedup_pages)
+    """
+    await _get_default_converter().convert(source, output_dir, output_format, **kwargs)
+
+
+async def iter_pdf_pages_async(source: str, output_dir: str, output_format: str = "all",
+                               **kwargs) -> AsyncIterator[Tuple[str, int, Any]]:
+    """
+    Converts PDF and yields (format_name, page_number, content) for each finished page.
+    Uses the same shared AsyncPdfConverter as convert_pdf_async.
+    """
+    pages = _get_default_converter().iter_pages(source, output_dir, output_format, **kwargs)
+    try:
+        async for item in pages:
+            yield item
+    finally:
+        await pages.aclose()
@@ -0,0 +1,72 @@
+# docling-page-wise-pdf-converter/batch_journal.py
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class BatchJournal:
+    """
+    Append-only journal of completed conversion units for a batch run.
+
+    A unit is one (document, format, pages) triple whose content file has been written and verified.
+    Each unit is appended as one JSON line and fsynced, so after a crash the journal holds every
+    unit that finished; a line cut short by the crash is ignored when the journal is reloaded.
+    """
+    def __init__(self, journal_path: Path):
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._units: Dict[Tuple[str, str], Dict] = {}
+        self._needs_newline = False
+        self._load()
+
+    def _load(self):
+        """
+        Reads the completed units recorded by previous runs.
+        """
+        if not self.journal_path.exists():
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                self._needs_newline = not line.endswith("\n")
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written line from an interrupted run
+                if entry.get("event") == "unit":
+                    self._units[(entry["document"], entry["format"])] = entry
+
+    def record_unit(self, document: str, format_name: str, pages: List[int], checksum: str):
+        """
+        Records a completed and verified unit.
+        """
+        entry = {
+            "event": "unit",
+            "document": document,
+            "format": format_name,
+            "pages": sorted(pages),
+            "checksum": checksum,
+            "time": time.time(),
+        }
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            if self._needs_newline:
+                f.write("\n")  # Terminate the partial line so it stays separate from this entry
+                self._needs_newline = False
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._units[(document, format_name)] = entry
+
+    def get_unit(self, document: str, format_name: str) -> Optional[Dict]:
+        """
+        Returns the journal entry for a unit, or None if it has not been completed.
+        """
+        return self._units.get((document, format_name))
+
+    def is_unit_complete(self, document: str, format_name: str, checksum: Optional[str]) -> bool:
+        """
+        Checks if a unit was completed and its content file still matches the recorded checksum.
+        """
+        entry = self.get_unit(document, format_name)
+        return entry is not None and checksum is not None and entry["checksum"] == checksum
@@ -0,0 +1,342 @@
+# docling-page-wise-pdf-converter/batch_scheduler.py
+import glob
+import heapq
+import json
+import math
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .batch_journal import BatchJournal
+from .chunker import update_chunk_index
+from .content_manager import ContentManager, atomic_write_json
+from .page_scanner import count_pages
+from .pdf_converter import (
+    SUPPORTED_FORMATS,
+    PdfConverter,
+    _create_format_converters,
+    _document_key,
+    _journal_unit,
+    _page_range_stem,
+    _pending_formats,
+    _source_filename,
+)
+
+
+class BatchJob(NamedTuple):
+    """
+    One unit of scheduled work: a whole document or a page range of it.
+    """
+    source: str
+    pages: Optional[int]  # Pages in this job, None if the page count is unknown
+    size: int  # File size in bytes, 0 if unknown
+    estimate: float  # Estimated seconds
+    page_range: Optional[Tuple[int, int]] = None
+
+
+class TimingHistory:
+    """
+    Per-document conversion timings that improve the runtime estimates of later batches.
+
+    Each document keeps a smoothed seconds-per-page rate; documents without history are estimated
+    from the smoothed rates of all documents, by page count or, if that is unknown, by file size.
+    """
+    DEFAULT_SECONDS_PER_PAGE = 2.0
+    DEFAULT_SECONDS_PER_MB = 10.0
+    DEFAULT_PAGES = 10  # Assumed for sources whose page count and size are both unknown (e.g. URLs)
+    SMOOTHING = 0.3  # Weight of the newest measurement in the smoothed rates
+    MAX_BATCH_REPORTS = 20
+
+    def __init__(self, history_path: Optional[Path] = None):
+        self.history_path = Path(history_path) if history_path else None
+        self.data = {
+            "seconds_per_page": self.DEFAULT_SECONDS_PER_PAGE,
+            "seconds_per_mb": self.DEFAULT_SECONDS_PER_MB,
+            "documents": {},
+            "batches": [],
+        }
+        if self.history_path and self.history_path.exists():
+            try:
+                with open(self.history_path, 'r', encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except json.JSONDecodeError:
+                print(f"Warning: Could not decode JSON from {self.history_path}. Starting a new timing history.")
+
+    def _smooth(self, previous: float, measured: float) -> float:
+        return (1 - self.SMOOTHING) * previous + self.SMOOTHING * measured
+
+    def estimate(self, document: str, pages: Optional[int], size: int) -> float:
+        """
+        Estimates the seconds needed to convert pages of a document.
+        """
+        entry = self.data["documents"].get(document)
+        if pages:
+            rate = entry["seconds_per_page"] if entry else self.data["seconds_per_page"]
+            return pages * rate
+        if size:
+            return size / 1e6 * self.data["seconds_per_mb"]
+        return self.DEFAULT_PAGES * self.data["seconds_per_page"]
+
+    def record(self, document: str, pages: Optional[int], size: int, seconds: float):
+        """
+        Adds a measured conversion time of pages of a document.
+        """
+        if pages:
+            rate = seconds / pages
+            entry = self.data["documents"].get(document)
+            self.data["documents"][document] = {
+                "seconds_per_page": self._smooth(entry["seconds_per_page"], rate) if entry else rate,
+                "updated": time.time(),
+            }
+            self.data["seconds_per_page"] = self._smooth(self.data["seconds_per_page"], rate)
+        if size:
+            self.data["seconds_per_mb"] = self._smooth(self.data["seconds_per_mb"], seconds / (size / 1e6))
+
+    def record_batch(self, report: Dict):
+        """
+        Keeps the report of a finished batch.
+        """
+        self.data["batches"] = (self.data["batches"] + [report])[-self.MAX_BATCH_REPORTS:]
+
+    def save(self):
+        if self.history_path:
+            atomic_write_json(self.history_path, self.data)
+
+
+def scan_source(source: str) -> Tuple[Optional[int], int]:
+    """
+    Cheaply determines the page count and file size of a source.
+    URLs are not downloaded, so both are unknown (None and 0) for them.
+    """
+    if '://' in source:
+        return None, 0
+    path = Path(source)
+    size = path.stat().st_size if path.exists() else 0
+    return count_pages(path), size
+
+
+def _expected_makespan(estimates: List[float], workers: int) -> float:
+    """
+    Simulates assigning jobs in the given order to whichever worker becomes free first.
+    """
+    loads = [0.0] * workers
+    for estimate in estimates:
+        heapq.heappush(loads, heapq.heappop(loads) + estimate)
+    return max(loads)
+
+
+def plan_batch(sources: Iterable[str], workers: int = 1, history: Optional[TimingHistory] = None,
+               split_pages: bool = True, min_split_pages: int = 50) -> Tuple[List[BatchJob], float]:
+    """
+    Plans a batch so that it finishes as early as possible on the given number of workers.
+
+    Documents are estimated from their page count, file size and timing history, and scheduled
+    largest first. With split_pages, a document estimated to take longer than its fair share of the
+    batch (the total estimate divided by the number of workers) is split into page ranges of at least
+    min_split_pages pages, so that one large document does not leave the other workers idle at the end.
+
+    Returns:
+        The jobs in scheduling order and the expected makespan in seconds.
+    """
+    history = history or TimingHistory()
+    jobs = []
+    for source in sources:
+        pages, size = scan_source(source)
+        jobs.append(BatchJob(source, pages, size, history.estimate(_document_key(source), pages, size)))
+
+    if split_pages and workers > 1 and jobs:
+        fair_share = sum(job.estimate for job in jobs) / workers
+        split_jobs = []
+        for job in jobs:
+            parts = min(math.ceil(job.estimate / fair_share), (job.pages or 0) // min_split_pages, workers)
+            if parts < 2:
+                split_jobs.append(job)
+                continue
+            bounds = [round(i * job.pages / parts) for i in range(parts + 1)]
+            for start, end in zip(bounds, bounds[1:]):
+                part_size = job.size * (end - start) // job.pages
+                split_jobs.append(BatchJob(job.source, end - start, part_size, job.estimate * (end - start) / job.pages,
+                                           (start + 1, end)))
+        jobs = split_jobs
+
+    jobs.sort(key=lambda job: job.estimate, reverse=True)
+    return jobs, _expected_makespan([job.estimate for job in jobs], workers)
+
+
+def _run_job(source: str, output_dir: str, formats: List[str], page_range: Optional[Tuple[int, int]],
+             converter_options: Dict) -> Tuple[float, List[int]]:
+    """
+    Converts one job and returns the elapsed seconds and the page numbers of the job.
+    Runs in a worker process when the batch is parallel.
+    """
+    start_time = time.time()
+    converter = PdfConverter(source, output_dir, page_range=page_range, **converter_options)
+    converter.convert_formats(formats)
+    return time.time() - start_time, converter._expected_pages()
+
+
+def merge_page_range_parts(output_dir: str, source: str, page_ranges: List[Tuple[int, int]], formats: List[str],
+                           chunk_max_tokens: Optional[int] = 512):
+    """
+    Merges the content of separately converted page ranges into the document's content and format files,
+    then removes the page range content. Pages that a part references in the page cache stay references.
+    """
+    output_dir_path = Path(output_dir)
+    content_manager = ContentManager(output_dir_path)
+    output_filename = _source_filename(source)
+    pdf_stem = output_filename.stem
+    format_converters = _create_format_converters()
+    part_stems = [_page_range_stem(pdf_stem, page_range) for page_range in sorted(page_ranges)]
+
+    for format_name in formats:
+        page_contents, page_refs = {}, {}
+        for part_stem in part_stems:
+            part_contents = content_manager.load_content(part_stem, format_name)
+            if part_contents is None:
+                raise RuntimeError(f"Content for {format_name} of {part_stem} is missing; cannot merge {pdf_stem}.")
+            page_contents.update(part_contents)
+            page_refs.update(content_manager.load_page_refs(part_stem, format_name))
+        page_contents = dict(sorted(page_contents.items()))
+        # Format file first, as in PdfConverter, so an existing content file implies a complete export
+        format_converters[format_name].save_with_original_extension(page_contents, output_filename, output_dir_path, None)
+        content_manager.save_content(pdf_stem, format_name, page_contents, page_refs)
+        if format_name == "markdown" and chunk_max_tokens is not None:
+            update_chunk_index(content_manager, pdf_stem, page_contents, chunk_max_tokens)
+
+    for part_stem in part_stems:
+        for format_name in formats:
+            content_manager.discard_content(part_stem, format_name)
+
+
+def _discard_stale_parts(content_manager: ContentManager, pdf_stem: str, page_ranges: List[Tuple[int, int]]):
+    """
+    Removes the page range content of a document that an interrupted run split at other page bounds.
+    Parts of the given page ranges are kept to be reused.
+    """
+    kept_stems = {_page_range_stem(pdf_stem, page_range) for page_range in page_ranges}
+    part_stem_pattern = re.compile(re.escape(pdf_stem) + r"\.pages\d+-\d+")
+    for format_name in SUPPORTED_FORMATS:
+        suffix = f".{format_name}.json"
+        for content_path in content_manager.output_dir.glob(f"{glob.escape(pdf_stem)}.pages*-*{suffix}"):
+            part_stem = content_path.name[:-len(suffix)]
+            if part_stem_pattern.fullmatch(part_stem) and part_stem not in kept_stems:
+                content_manager.discard_content(part_stem, format_name)
+
+
+def run_scheduled_batch(sources: Iterable[str], output_dir: str, output_format: str = "all", workers: int = 1,
+                        split_pages: bool = True, min_split_pages: int = 50, journal_path: Optional[str] = None,
+                        history_path: Optional[str] = None, **converter_options) -> Dict:
+    """
+    Converts a batch of PDFs on several worker processes, scheduling the largest jobs first.
+
+    Like convert_batch, completed (document, format) units are journaled and skipped when the batch is
+    run again. Measured timings are kept in a history file and improve the estimates of later batches.
+
+    Args:
+        sources: Paths to the input PDF files or URLs
+        output_dir: Directory for output files
+        output_format: The desired output format (see convert_pdf). Defaults to "all".
+        workers: Number of worker processes. Defaults to 1.
+        split_pages: If True, documents much larger than the rest are split into page ranges (see plan_batch).
+        min_split_pages: Minimum number of pages in a page range.
+        journal_path: Path to the batch journal. Defaults to ".batch_journal.jsonl" in output_dir.
+        history_path: Path to the timing history. Defaults to ".timing_history.json" in output_dir.
+        **converter_options: Further PdfConverter options (e.g. ocr_routing, dedup_pages, chunk_max_tokens)
+
+    Returns:
+        A report with the number of jobs, the expected and the actual makespan in seconds.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    output_dir_path = Path(output_dir)
+    output_dir_path.mkdir(parents=True, exist_ok=True)
+    journal = BatchJournal(Path(journal_path) if journal_path else output_dir_path / ".batch_journal.jsonl")
+    history = TimingHistory(Path(history_path) if history_path else output_dir_path / ".timing_history.json")
+    content_manager = ContentManager(output_dir_path)
+    formats = SUPPORTED_FORMATS if output_format == "all" else [output_format]
+
+    pending: Dict[str, List[str]] = {}
+    for source in sources:
+        pending_formats = _pending_formats(journal, content_manager, _document_key(source), _source_filename(source).stem, formats)
+        if pending_formats:
+            pending[source] = pending_formats
+        else:
+            print(f"All formats for {_source_filename(source).stem} are complete. Skipping conversion.")
+
+    jobs, expected_makespan = plan_batch(pending, workers, history, split_pages, min_split_pages)
+    page_ranges: Dict[str, List[Tuple[int, int]]] = {}
+    for job in jobs:
+        if job.page_range is not None:
+            page_ranges.setdefault(job.source, []).append(job.page_range)
+    for source in pending:
+        _discard_stale_parts(content_manager, _source_filename(source).stem, page_ranges.get(source, []))
+    print(f"Scheduled {len(jobs)} jobs from {len(pending)} documents on {workers} worker(s); "
+          f"expected makespan {expected_makespan:.1f}s.")
+
+    remaining_parts = {source: len(ranges) for source, ranges in page_ranges.items()}
+    start_time = time.time()
+
+    def finish_job(job: BatchJob, result: Optional[Tuple[float, List[int]]]):
+        """
+        Records a finished job and journals its document once all of its jobs are done.
+        """
+        document = _document_key(job.source)
+        if result is not None:
+            history.record(document, job.pages, job.size, result[0])
+        if job.page_range is not None:
+            remaining_parts[job.source] -= 1
+            if remaining_parts[job.source]:
+                return
+            merge_page_range_parts(output_dir, job.source, page_ranges[job.source], pending[job.source],
+                                   converter_options.get("chunk_max_tokens", 512))
+            # The page ranges of a split document cover all of its pages
+            expected_pages = [page for start, end in page_ranges[job.source] for page in range(start, end + 1)]
+        else:
+            expected_pages = result[1]
+        for format_name in pending[job.source]:
+            if not _journal_unit(journal, content_manager, document, _source_filename(job.source).stem, format_name,
+                                 expected_pages):
+                print(f"Warning: Content for {format_name} of {job.source} failed verification and was not journaled.")
+
+    def part_is_complete(job: BatchJob) -> bool:
+        # Page range content left by an interrupted run is reused instead of converted again
+        part_stem = _page_range_stem(_source_filename(job.source).stem, job.page_range)
+        return all(content_manager.has_content(part_stem, format_name) for format_name in pending[job.source])
+
+    try:
+        runnable = []
+        for job in jobs:
+            if job.page_range is not None and part_is_complete(job):
+                finish_job(job, None)
+            else:
+                runnable.append(job)
+
+        if workers == 1:
+            for job in runnable:
+                finish_job(job, _run_job(job.source, output_dir, pending[job.source], job.page_range, converter_options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # The pool starts jobs in submission order, so the largest jobs start first
+                futures = {
+                    executor.submit(_run_job, job.source, output_dir, pending[job.source], job.page_range, converter_options): job
+                    for job in runnable
+                }
+                for future in as_completed(futures):
+                    finish_job(futures[future], future.result())
+    finally:
+        actual_makespan = time.time() - start_time
+        report = {
+            "time": start_time,
+            "workers": workers,
+            "documents": len(pending),
+            "jobs": len(jobs),
+            "expected_makespan": expected_makespan,
+            "actual_makespan": actual_makespan,
+        }
+        history.record_batch(report)
+        history.save()
+
+    print(f"Batch complete: expected makespan {expected_makespan:.1f}s, actual makespan {actual_makespan:.1f}s.")
+    return report
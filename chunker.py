@@ -0,0 +1,247 @@
+# docling-page-wise-pdf-converter/chunker.py
+import bisect
+import hashlib
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+CHUNK_INDEX_VERSION = 1
+PAGE_SEPARATOR = "\n\n"  # Joins page contents into the document text that chunk offsets refer to
+
+_HEADING = re.compile(r"#{1,6}\s")
+_SENTENCE = re.compile(r"\S.*?(?:[.!?](?=\s)|\Z)", re.S)
+_WORD = re.compile(r"\S+")
+_LINE = re.compile(r"[^\n]+")
+
+
+class _Block(NamedTuple):
+    start: int
+    end: int
+    kind: str  # "heading", "table" or "text"
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximates the token count of a text by its number of whitespace-separated words.
+    """
+    return len(text.split())
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def join_pages(page_contents: Dict[int, str]) -> Tuple[str, Dict[int, Tuple[int, int]]]:
+    """
+    Joins page contents in page order and returns the document text with each page's character span.
+    """
+    parts, page_spans, offset = [], {}, 0
+    for page_number in sorted(page_contents):
+        if parts:
+            parts.append(PAGE_SEPARATOR)
+            offset += len(PAGE_SEPARATOR)
+        content = page_contents[page_number] or ""
+        parts.append(content)
+        page_spans[page_number] = (offset, offset + len(content))
+        offset += len(content)
+    return "".join(parts), page_spans
+
+
+def _split_blocks(text: str) -> List[_Block]:
+    """
+    Splits Markdown into blocks: headings, tables and paragraphs separated by blank lines.
+    """
+    blocks: List[_Block] = []
+    current: Optional[List] = None  # [start, end, kind]
+    for line in _LINE.finditer(text):
+        stripped = line.group().strip()
+        if not stripped:
+            if current:
+                blocks.append(_Block(*current))
+            current = None
+            continue
+        if _HEADING.match(stripped):
+            if current:
+                blocks.append(_Block(*current))
+            blocks.append(_Block(line.start(), line.end(), "heading"))
+            current = None
+            continue
+        kind = "table" if stripped.startswith("|") else "text"
+        if current and current[2] == kind and text[current[1]:line.start()].count("\n") == 1:
+            current[1] = line.end()
+        else:
+            if current:
+                blocks.append(_Block(*current))
+            current = [line.start(), line.end(), kind]
+    if current:
+        blocks.append(_Block(*current))
+    return blocks
+
+
+def _split_sections(blocks: List[_Block]) -> List[List[_Block]]:
+    """
+    Groups blocks into sections that each start at a heading (except a possible preamble).
+    """
+    sections: List[List[_Block]] = []
+    for block in blocks:
+        if block.kind == "heading" or not sections:
+            sections.append([])
+        sections[-1].append(block)
+    return sections
+
+
+def _split_oversized(text: str, block: _Block, max_tokens: int, token_counter: Callable[[str], int],
+                     first_limit: int) -> List[Tuple[int, int]]:
+    """
+    Splits a block that exceeds max_tokens into spans: tables at row boundaries,
+    other text at sentence boundaries, falling back to words for overlong sentences or rows.
+    The first span holds at most first_limit tokens so that it fits behind the preceding blocks.
+    """
+    unit_pattern = _LINE if block.kind == "table" else _SENTENCE
+    units = []
+    for unit in unit_pattern.finditer(text, block.start, block.end):
+        start, end = unit.start(), unit.end()
+        if token_counter(text[start:end]) > max_tokens:
+            units.extend((word.start(), word.end()) for word in _WORD.finditer(text, start, end))
+        else:
+            units.append((start, end))
+
+    spans: List[Tuple[int, int]] = []
+    for start, end in units:
+        limit = first_limit if len(spans) == 1 else max_tokens
+        if spans and token_counter(text[spans[-1][0]:end]) <= limit:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _chunk_section(text: str, section: List[_Block], max_tokens: int, token_counter: Callable[[str], int]) -> List[Tuple[int, int]]:
+    """
+    Packs the blocks of a section into spans of at most max_tokens without splitting a block
+    unless the block alone is larger than max_tokens.
+    """
+    spans: List[Tuple[int, int]] = []
+    current: Optional[Tuple[int, int]] = None
+    current_tokens = 0
+    for block in section:
+        block_tokens = token_counter(text[block.start:block.end])
+        if block_tokens <= max_tokens:
+            pieces = [(block.start, block.end)]
+        else:
+            pieces = _split_oversized(text, block, max_tokens, token_counter, max_tokens - current_tokens)
+        for start, end in pieces:
+            piece_tokens = block_tokens if len(pieces) == 1 else token_counter(text[start:end])
+            if current is not None and current_tokens + piece_tokens > max_tokens:
+                spans.append(current)
+                current, current_tokens = None, 0
+            current = (current[0] if current else start, end)
+            current_tokens += piece_tokens
+    if current is not None:
+        spans.append(current)
+    return spans
+
+
+def build_chunk_index(page_contents: Dict[int, str], pdf_stem: str, max_tokens: int = 512,
+                      previous: Optional[Dict] = None, token_counter: Callable[[str], int] = count_tokens) -> Dict:
+    """
+    Builds a retrieval chunk index from Markdown page contents.
+
+    Chunks hold at most max_tokens tokens, never cross a heading and keep tables whole unless a table
+    alone is too large, in which case it is split between rows. Each chunk records its text, its character
+    offsets in the document text (the pages joined with PAGE_SEPARATOR), the pages it spans and its heading.
+
+    If a previous index built with the same max_tokens is given, sections whose text is unchanged reuse
+    their chunks with shifted offsets and only changed sections are chunked again.
+
+    Returns:
+        The chunk index, a dictionary with "pages" (page number -> span and content hash) and "chunks".
+    """
+    text, page_spans = join_pages(page_contents)
+    page_starts = [span[0] for span in page_spans.values()]
+    page_numbers = list(page_spans.keys())
+
+    # Chunks of the previous index per section hash, grouped by occurrence of the section
+    reusable: Dict[str, Dict[int, List[Dict]]] = {}
+    if previous and previous.get("version") == CHUNK_INDEX_VERSION and previous.get("max_tokens") == max_tokens:
+        for chunk in previous["chunks"]:
+            reusable.setdefault(chunk["section"], {}).setdefault(chunk["section_start"], []).append(chunk)
+
+    chunks, reused_sections, seen_ids = [], 0, {}
+    for section in _split_sections(_split_blocks(text)):
+        section_start, section_end = section[0].start, section[-1].end
+        section_hash = _hash(text[section_start:section_end])
+        heading = text[section[0].start:section[0].end].lstrip("# ").strip() if section[0].kind == "heading" else None
+
+        if reusable.get(section_hash):
+            occurrences = reusable[section_hash]
+            old_section_start = next(iter(occurrences))
+            old_chunks = occurrences.pop(old_section_start)
+            shift = section_start - old_section_start
+            spans = [(chunk["start"] + shift, chunk["end"] + shift) for chunk in old_chunks]
+            reused_sections += 1
+        else:
+            spans = _chunk_section(text, section, max_tokens, token_counter)
+
+        for start, end in spans:
+            chunk_text = text[start:end]
+            chunk_id = f"{pdf_stem}-{_hash(chunk_text)[:12]}"
+            seen_ids[chunk_id] = seen_ids.get(chunk_id, 0) + 1
+            if seen_ids[chunk_id] > 1:
+                chunk_id = f"{chunk_id}-{seen_ids[chunk_id]}"
+            chunks.append({
+                "id": chunk_id,
+                "text": chunk_text,
+                "start": start,
+                "end": end,
+                "page_start": page_numbers[bisect.bisect_right(page_starts, start) - 1],
+                "page_end": page_numbers[bisect.bisect_right(page_starts, end - 1) - 1],
+                "heading": heading,
+                "tokens": token_counter(chunk_text),
+                "section": section_hash,
+                "section_start": section_start,
+            })
+
+    return {
+        "version": CHUNK_INDEX_VERSION,
+        "document_name": pdf_stem,
+        "max_tokens": max_tokens,
+        "separator": PAGE_SEPARATOR,
+        "reused_sections": reused_sections,
+        "pages": {
+            str(page_number): {"start": start, "end": end, "hash": _hash(page_contents[page_number] or "")}
+            for page_number, (start, end) in page_spans.items()
+        },
+        "chunks": chunks,
+    }
+
+
+def update_chunk_index(content_manager, pdf_stem: str, page_contents: Optional[Dict[int, str]] = None,
+                       max_tokens: int = 512, format_name: str = "markdown") -> Optional[Dict]:
+    """
+    Builds or incrementally rebuilds the chunk index of a document and saves it with the content manager.
+
+    Args:
+        content_manager: The ContentManager holding the document's content.
+        pdf_stem: Stem of the PDF file name.
+        page_contents: Page contents to chunk. Defaults to the saved content of format_name.
+        max_tokens: Maximum number of tokens per chunk.
+        format_name: Format whose content is chunked when page_contents is not given.
+
+    Returns:
+        The chunk index, or None if there is no content to chunk.
+    """
+    if page_contents is None:
+        page_contents = content_manager.load_content(pdf_stem, format_name)
+        if page_contents is None:
+            return None
+
+    previous = content_manager.load_chunk_index(pdf_stem)
+    if previous and previous.get("version") == CHUNK_INDEX_VERSION and previous.get("max_tokens") == max_tokens:
+        page_hashes = {str(page_number): _hash(content or "") for page_number, content in page_contents.items()}
+        if page_hashes == {page: info["hash"] for page, info in previous["pages"].items()}:
+            return previous  # No page changed
+
+    index = build_chunk_index(page_contents, pdf_stem, max_tokens, previous=previous)
+    content_manager.save_chunk_index(pdf_stem, index)
+    print(f"Chunk index for {pdf_stem}: {len(index['chunks'])} chunks, {index['reused_sections']} unchanged sections reused.")
+    return index
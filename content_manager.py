@@ -1,7 +1,11 @@
 # docling-page-wise-pdf-converter/content_manager.py
+import asyncio
+import hashlib
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Tuple, Union, List
 
 class ContentManager:
     """
@@ -10,6 +14,7 @@ class ContentManager:
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._format_converters: Dict[str, Any] = {}  # Created on first use, to relabel shared pages
 
     def _get_content_path(self, pdf_stem: str, format_name: str) -> Path:
         """
@@ -17,27 +22,117 @@ class ContentManager:
         """
         return self.output_dir / f"{pdf_stem}.{format_name}.json"
 
+    def _get_shared_page_path(self, page_hash: str, format_name: str) -> Path:
+        """
+        Constructs the path to a shared page in the content-addressed page cache.
+        """
+        return self.output_dir / ".page_cache" / page_hash[:2] / f"{page_hash}.{format_name}.json"
+
     def has_content(self, pdf_stem: str, format_name: str) -> bool:
         """
-        Checks if content for a given format already exists.
+        Checks if complete content for a given format already exists.
+        A file that exists but cannot be decoded (e.g. left truncated by a crash) does not count.
+        """
+        return self.verify_content(pdf_stem, format_name)
+
+    def verify_content(self, pdf_stem: str, format_name: str, expected_pages: Optional[List[int]] = None) -> bool:
+        """
+        Checks that the content file for a given format decodes and, optionally, holds exactly the expected pages.
+        """
+        content_path = self._get_content_path(pdf_stem, format_name)
+        if not content_path.exists():
+            return False
+        try:
+            with open(content_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            pages = [item['page'] for item in data]
+            refs = [item['ref'] for item in data if 'ref' in item]
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+            return False
+        if not all(self._get_shared_page_path(ref, format_name).exists() for ref in refs):
+            return False
+        if expected_pages is not None:
+            return sorted(pages) == sorted(expected_pages)
+        return True
+
+    def content_checksum(self, pdf_stem: str, format_name: str) -> Optional[str]:
+        """
+        Returns the SHA-256 checksum of the content file for a given format, or None if it does not exist.
         """
         content_path = self._get_content_path(pdf_stem, format_name)
-        return content_path.exists()
+        if not content_path.exists():
+            return None
+        digest = hashlib.sha256()
+        with open(content_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def discard_content(self, pdf_stem: str, format_name: str):
+        """
+        Removes the content file for a given format so that it is regenerated on the next conversion.
+        """
+        self._get_content_path(pdf_stem, format_name).unlink(missing_ok=True)
 
-    def save_content(self, pdf_stem: str, format_name: str, page_contents: Dict[int, str]):
+    def save_content(self, pdf_stem: str, format_name: str, page_contents: Dict[int, str], page_refs: Optional[Dict[int, str]] = None):
         """
         Saves the page content to a JSON file.
+        The file is written to a temporary file in the same directory and renamed into place,
+        so a crash never leaves a partially written content file behind.
+        Pages listed in page_refs are stored as references to their shared copy in the page cache.
         """
         content_path = self._get_content_path(pdf_stem, format_name)
+        page_refs = page_refs or {}
         data = []
         for page_num, content in page_contents.items():
-            data.append({"page": page_num, "content": content})
-        with open(content_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            if page_num in page_refs:
+                data.append({"page": page_num, "ref": page_refs[page_num]})
+            else:
+                data.append({"page": page_num, "content": content})
+        atomic_write_json(content_path, data)
+
+    def load_shared_page(self, page_hash: str, format_name: str) -> Optional[Tuple[Any, int]]:
+        """
+        Loads a shared page from the page cache.
+        Returns its content and the page number it was converted for, or None if it is not cached.
+        """
+        shared_path = self._get_shared_page_path(page_hash, format_name)
+        if not shared_path.exists():
+            return None
+        try:
+            with open(shared_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data['content'], data['page']
+        except (json.JSONDecodeError, KeyError):
+            print(f"Warning: Could not decode JSON from {shared_path}. File might be corrupted.")
+            return None
+
+    def save_shared_page(self, page_hash: str, format_name: str, content, page_number: int) -> bool:
+        """
+        Adds a page to the page cache. Shared pages are never overwritten once written.
+        Returns True if this call added the page, False if it was already cached.
+        """
+        shared_path = self._get_shared_page_path(page_hash, format_name)
+        if shared_path.exists():
+            return False
+        shared_path.parent.mkdir(parents=True, exist_ok=True)
+        return atomic_write_json(shared_path, {"page": page_number, "content": content}, overwrite=False)
+
+    def _relabel_shared_page(self, format_name: str, content, page_number: int):
+        """
+        Adapts a shared page converted for another page number, using the converter of its format.
+        """
+        if format_name not in self._format_converters:
+            from .format_converters import FORMAT_CONVERTERS  # Imported on first use; it pulls in docling
+            converter_class = FORMAT_CONVERTERS.get(format_name)
+            self._format_converters[format_name] = converter_class() if converter_class is not None else None
+        converter = self._format_converters[format_name]
+        return converter.relabel_page(content, page_number) if converter is not None else content
 
     def load_content(self, pdf_stem: str, format_name: str) -> Optional[Dict[int, str]]:
         """
         Loads the page content from a JSON file.
+        Shared pages are relabelled if they were cached for another page number.
         """
         content_path = self._get_content_path(pdf_stem, format_name)
         if not content_path.exists():
@@ -47,12 +142,85 @@ class ContentManager:
             with open(content_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 for item in data:
-                    page_contents[item['page']] = item['content']
+                    if 'ref' in item:
+                        shared = self.load_shared_page(item['ref'], format_name)
+                        if shared is None:
+                            print(f"Warning: Shared page {item['ref']} referenced by {content_path} is missing.")
+                            return None
+                        content, shared_page = shared
+                        if shared_page != item['page']:
+                            content = self._relabel_shared_page(format_name, content, item['page'])
+                        page_contents[item['page']] = content
+                    else:
+                        page_contents[item['page']] = item['content']
             return page_contents
         except json.JSONDecodeError:
             print(f"Warning: Could not decode JSON from {content_path}. File might be corrupted.")
             return None
 
+    def load_page_refs(self, pdf_stem: str, format_name: str) -> Dict[int, str]:
+        """
+        Returns the shared page hash of every page that the content file stores as a reference.
+        """
+        content_path = self._get_content_path(pdf_stem, format_name)
+        if not content_path.exists():
+            return {}
+        try:
+            with open(content_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {item['page']: item['ref'] for item in data if 'ref' in item}
+        except (json.JSONDecodeError, KeyError, TypeError):
+            print(f"Warning: Could not decode JSON from {content_path}. File might be corrupted.")
+            return {}
+
+    async def load_content_async(self, pdf_stem: str, format_name: str) -> Optional[Dict[int, str]]:
+        """
+        Loads the page content from a JSON file without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.load_content, pdf_stem, format_name)
+
+    def _get_chunk_index_path(self, pdf_stem: str) -> Path:
+        """
+        Constructs the path to the chunk index of a document.
+        """
+        return self.output_dir / f"{pdf_stem}.chunks.json"
+
+    def save_chunk_index(self, pdf_stem: str, chunk_index: Dict):
+        """
+        Saves the retrieval chunk index of a document.
+        """
+        atomic_write_json(self._get_chunk_index_path(pdf_stem), chunk_index, indent=None)
+
+    def load_chunk_index(self, pdf_stem: str) -> Optional[Dict]:
+        """
+        Loads the retrieval chunk index of a document, or None if it has not been built.
+        """
+        index_path = self._get_chunk_index_path(pdf_stem)
+        if not index_path.exists():
+            return None
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            print(f"Warning: Could not decode JSON from {index_path}. File might be corrupted.")
+            return None
+
+    def load_chunks(self, pdf_stem: str) -> Optional[List[Dict]]:
+        """
+        Loads all retrieval chunks of a document with their text, character offsets and page spans.
+        """
+        chunk_index = self.load_chunk_index(pdf_stem)
+        return chunk_index["chunks"] if chunk_index else None
+
+    def get_chunk(self, pdf_stem: str, chunk_id: str) -> Optional[Dict]:
+        """
+        Retrieves a single retrieval chunk by its ID.
+        """
+        for chunk in self.load_chunks(pdf_stem) or []:
+            if chunk["id"] == chunk_id:
+                return chunk
+        return None
+
     def get_page_content_plain_text(self, pdf_stem: str, format_name: str, page: Union[int, List[int]]) -> Optional[Union[str, List[str]]]:
         """
         Retrieves the plain text content of a specific page or pages from a saved format.
@@ -77,12 +245,46 @@ class ContentManager:
             else:
                 return None
         elif isinstance(page, list):
-            results = ""
+            results = []
             for page_num in page:
                 if page_num in page_contents:
-                    results += page_contents[page_num]
+                    results.append(page_contents[page_num])
                 else:
                     return None  # Return None if content for any page in the list is missing
-            return results.strip()
+            return "".join(results).strip()
         else:
-            raise TypeError("page must be an int or a list of ints")
\ No newline at end of file
+            raise TypeError("page must be an int or a list of ints")
+
+    async def get_page_content_plain_text_async(self, pdf_stem: str, format_name: str, page: Union[int, List[int]]) -> Optional[Union[str, List[str]]]:
+        """
+        Retrieves the plain text content of a specific page or pages without blocking the event loop.
+        See get_page_content_plain_text.
+        """
+        return await asyncio.to_thread(self.get_page_content_plain_text, pdf_stem, format_name, page)
+
+
+def atomic_write_json(path: Path, data, indent: Optional[int] = 2, overwrite: bool = True) -> bool:
+    """
+    Writes data as JSON to path via a temporary file and an atomic rename.
+    With overwrite=False the temporary file is hard-linked into place instead, so an existing file,
+    even one created concurrently by another process, is kept. Returns whether path was written.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        if overwrite:
+            os.replace(tmp_name, path)
+            return True
+        try:
+            os.link(tmp_name, path)
+        except FileExistsError:
+            return False
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return True
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -1,4 +1,22 @@
 # docling-page-wise-pdf-converter/format_converters/__init__.py
 """
 Package containing format converters for PDF documents.
-"""
\ No newline at end of file
+"""
+from .markdown_converter import MarkdownConverter
+from .html_converter import HtmlConverter
+from .txt_converter import TxtConverter
+from .json_converter import JsonConverter
+from .yaml_converter import YamlConverter
+from .csv_converter import CsvConverter
+from .xml_converter import XmlConverter
+
+# Converter class of each output format
+FORMAT_CONVERTERS = {
+    "markdown": MarkdownConverter,
+    "html": HtmlConverter,
+    "txt": TxtConverter,
+    "json": JsonConverter,
+    "yaml": YamlConverter,
+    "csv": CsvConverter,
+    "xml": XmlConverter,
+}
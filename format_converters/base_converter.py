@@ -1,13 +1,28 @@
 # docling-page-wise-pdf-converter/format_converters/base_converter.py
-from abc import ABC, abstractmethod
+from abc import ABC
 from pathlib import Path
 from typing import Dict, Union
 
 class BaseConverter(ABC):
     """
     Abstract base class for format converters.
+
+    A converter implements convert_page. Converters that implement convert_to_format instead are
+    still supported: their convert_to_format is run once per docling document and its pages are used.
     """
-    @abstractmethod
+    def convert_page(self, doc, page_number: int):
+        """
+        Converts a single page of the document to a specific format.
+
+        Args:
+            doc: The document object from docling.
+            page_number: Number of the page to convert.
+
+        Returns:
+            The page content in the target format.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must implement convert_page or convert_to_format")
+
     def convert_to_format(self, doc, filename: Union[str, Path], output_dir: Path) -> Dict[int, str]:
         """
         Converts the document to a specific format and returns page contents.
@@ -20,12 +35,28 @@ class BaseConverter(ABC):
         Returns:
             A dictionary where keys are page numbers and values are page contents in the target format.
         """
-        pass
+        return {page_number: self.convert_page(doc, page_number) for page_number in doc.pages.keys()}
+
+    def converts_whole_documents(self) -> bool:
+        """
+        Checks if the converter overrides convert_to_format rather than converting page by page.
+        """
+        return type(self).convert_to_format is not BaseConverter.convert_to_format
+
+    def relabel_page(self, content, page_number: int):
+        """
+        Adapts content converted for another page to the given page number.
+        Formats that embed the page number in their page content override this.
+        """
+        return content
 
     def save_with_original_extension(self, page_contents: Dict[int, str], filename: Union[str, Path], output_dir: Path, doc):
         """
         Saves the converted content to files with the original format extension (e.g., .html, .md).
         This is an optional method and can be overridden by subclasses if needed.
+
+        doc is the docling document of the whole PDF, or None if the PDF was converted in several parts
+        (OCR routing, page batches or a split batch job), in which case page_contents is the only source.
         """
         pass # Optional method to save with original extension
 
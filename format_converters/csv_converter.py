@@ -6,46 +6,47 @@ from docling_core.types.doc import TableItem, PictureItem, TextItem
 from .base_converter import BaseConverter
 
 class CsvConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, List[Dict]]: # Return type is now Dict[int, List[Dict]]
+    def convert_page(self, doc, page_number: int) -> List[Dict]:
         """
-        Converts the document to CSV format and returns page-based data.
+        Converts a page of the document to CSV format.
         CSV export data is prepared here and saved in save_with_original_extension.
-        Returns a dictionary where keys are page numbers and values are lists of CSV rows (dictionaries).
+        Returns a list of CSV rows (dictionaries) for the page.
         """
-        pages_csv_data: Dict[int, List[Dict]] = {} # Initialize a dictionary to hold page-based CSV data
+        csv_rows_for_page: List[Dict] = [] # List to hold CSV rows for the current page
+        for item, _ in doc.iterate_items(page_no=page_number):
+            try:
+                element_type = item.__class__.__name__
+                content = ""
+                additional_info = ""
 
-        for page_number in doc.pages.keys():
-            csv_rows_for_page: List[Dict] = [] # List to hold CSV rows for the current page
-            for item, _ in doc.iterate_items(page_no=page_number):
-                try:
-                    element_type = item.__class__.__name__
-                    content = ""
-                    additional_info = ""
+                if isinstance(item, TextItem):
+                    content = item.text
+                elif isinstance(item, TableItem):
+                    try:
+                        content = "Table"
+                        additional_info = str(item.export_to_dataframe())
 
-                    if isinstance(item, TextItem):
-                        content = item.text
-                    elif isinstance(item, TableItem):
-                        try:
-                            content = "Table"
-                            additional_info = str(item.export_to_dataframe())
+                    except:
+                        content = "Table (not extractable)"
+                elif isinstance(item, PictureItem):
+                    content = "Image"
+                    additional_info = item.caption_text(doc) if hasattr(item, 'caption_text') else ""
 
-                        except:
-                            content = "Table (not extractable)"
-                    elif isinstance(item, PictureItem):
-                        content = "Image"
-                        additional_info = item.caption_text(doc) if hasattr(item, 'caption_text') else ""
+                csv_rows_for_page.append({ # Append a dictionary representing a CSV row
+                    "page_number": page_number,
+                    "element_type": element_type,
+                    "content": content,
+                    "additional_info": additional_info
+                })
+            except Exception as e:
+                print(f"Warning: Failed to process item for CSV on page {page_number}: {str(e)}")
+        return csv_rows_for_page # Return the rows for the current page
 
-                    csv_rows_for_page.append({ # Append a dictionary representing a CSV row
-                        "page_number": page_number,
-                        "element_type": element_type,
-                        "content": content,
-                        "additional_info": additional_info
-                    })
-                except Exception as e:
-                    print(f"Warning: Failed to process item for CSV on page {page_number}: {str(e)}")
-            pages_csv_data[page_number] = csv_rows_for_page # Store the list of rows for the current page
-
-        return pages_csv_data # Return the page-based CSV data
+    def relabel_page(self, content: List[Dict], page_number: int) -> List[Dict]:
+        """
+        Sets the page number of rows converted for another page.
+        """
+        return [{**row_dict, "page_number": page_number} for row_dict in content]
 
     def save_with_original_extension(self, page_contents: Dict[int, List[Dict]], pdf_path: Path, output_dir: Path, doc):
         """
@@ -7,16 +7,12 @@ from bs4 import BeautifulSoup
 
 
 class HtmlConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, str]:
+    def convert_page(self, doc, page_number: int) -> str:
         """
-        Converts the document to HTML format, extracting only the body content.
+        Converts a page of the document to HTML format, extracting only the body content.
         """
-        pages_content = {}
-        for page_number in doc.pages.keys():
-            full_html_content = doc.export_to_html(page_no=page_number)
-            body_content = self._extract_body_content(full_html_content) # Extract body content
-            pages_content[page_number] = body_content
-        return pages_content
+        full_html_content = doc.export_to_html(page_no=page_number)
+        return self._extract_body_content(full_html_content) # Extract body content
 
     def _extract_body_content(self, full_html: str) -> str:
         """
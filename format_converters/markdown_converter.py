@@ -4,16 +4,13 @@ from typing import Dict
 from .base_converter import BaseConverter
 
 class MarkdownConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, str]:
+    def convert_page(self, doc, page_number: int) -> str:
         """
-        Converts the document to Markdown format.
+        Converts a page of the document to Markdown format.
         """
-        pages_content = {}
-        for page_number in doc.pages.keys():
-            pages_content[page_number] = doc.export_to_markdown(
-                page_no=page_number
-            )
-        return pages_content
+        return doc.export_to_markdown(
+            page_no=page_number
+        )
 
     def save_with_original_extension(self, page_contents: Dict[int, str], pdf_path: Path, output_dir: Path, doc): # Added 'doc' here (but not used)
         """
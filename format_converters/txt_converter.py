@@ -5,27 +5,35 @@ from docling_core.types.doc import TableItem, PictureItem, TextItem
 from .base_converter import BaseConverter
 
 class TxtConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, str]:
+    def convert_page(self, doc, page_number: int) -> str:
         """
-        Converts the document to TXT format.
+        Converts a page of the document to TXT format.
         """
-        pages_content = {}
-        for page_number in doc.pages.keys():
-            text_sections = []
-            text_sections.append(f"\n{'='*3}Page {page_number}{'='*3}\n")
-
-
-            for item in doc.iterate_items(page_no=page_number):
-                if isinstance(item[0], TableItem):
-                    text_sections.append(item[0].export_to_dataframe().to_string())
-                elif isinstance(item[0], PictureItem): # todo: recognize image into text using LLM
-                    caption = item[0].caption_text(doc)
-                    text_sections.append(f"[Image: {caption}]" if caption else "[Image]")
-                elif isinstance(item[0], TextItem):
-                    text_sections.append(item[0].text)
-
-            pages_content[page_number] = "\n".join(text_sections)
-        return pages_content
+        text_sections = []
+        text_sections.append(self._page_header(page_number))
+
+
+        for item in doc.iterate_items(page_no=page_number):
+            if isinstance(item[0], TableItem):
+                text_sections.append(item[0].export_to_dataframe().to_string())
+            elif isinstance(item[0], PictureItem): # todo: recognize image into text using LLM
+                caption = item[0].caption_text(doc)
+                text_sections.append(f"[Image: {caption}]" if caption else "[Image]")
+            elif isinstance(item[0], TextItem):
+                text_sections.append(item[0].text)
+
+        return "\n".join(text_sections)
+
+    def _page_header(self, page_number: int) -> str:
+        return f"\n{'='*3}Page {page_number}{'='*3}\n"
+
+    def relabel_page(self, content: str, page_number: int) -> str:
+        """
+        Replaces the page header of content converted for another page.
+        """
+        header_close = f"{'='*3}\n"
+        header_end = content.index(header_close, len(f"\n{'='*3}Page ")) + len(header_close)
+        return self._page_header(page_number) + content[header_end:]
 
     def save_with_original_extension(self, page_contents: Dict[int, str], pdf_path: Path, output_dir: Path, doc): # Added 'doc' here (but not used)
         """
@@ -6,14 +6,19 @@ from docling_core.types.doc import TableItem, PictureItem, TextItem
 from .base_converter import BaseConverter
 
 class XmlConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, str]:
+    def convert_page(self, doc, page_number: int) -> str:
         """
-        Converts the document to XML format.
+        Converts a page of the document to XML format.
         """
-        pages_content = {}
-        for page_number in doc.pages.keys():
-            pages_content[page_number] = self._convert_page_to_xml(doc, page_number)
-        return pages_content
+        return self._convert_page_to_xml(doc, page_number)
+
+    def relabel_page(self, content: str, page_number: int) -> str:
+        """
+        Sets the page number of content converted for another page.
+        """
+        page_element = ET.fromstring(content)
+        page_element.set("number", str(page_number))
+        return ET.tostring(page_element, encoding="unicode")
 
     def _convert_page_to_xml(self, doc, page_number: int) -> str:
         """Helper function to convert a single page to XML."""
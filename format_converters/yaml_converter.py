@@ -6,14 +6,19 @@ from docling_core.types.doc import TableItem, PictureItem, TextItem
 from .base_converter import BaseConverter
 
 class YamlConverter(BaseConverter):
-    def convert_to_format(self, doc, pdf_path: Path, output_dir: Path) -> Dict[int, str]:
+    def convert_page(self, doc, page_number: int) -> str:
         """
-        Converts the document to YAML format.
+        Converts a page of the document to YAML format.
         """
-        pages_content = {}
-        for page_number in doc.pages.keys():
-            pages_content[page_number] = self._get_yaml_for_page(doc, page_number)
-        return pages_content
+        return self._get_yaml_for_page(doc, page_number)
+
+    def relabel_page(self, content: str, page_number: int) -> str:
+        """
+        Sets the page number of content converted for another page.
+        """
+        page_dict = yaml.safe_load(content)
+        page_dict["page_number"] = page_number
+        return yaml.dump(page_dict, sort_keys=False, allow_unicode=True)
 
     def _get_dict_for_page(self, doc, page_number: int) -> Dict:
         """
@@ -0,0 +1,49 @@
+# docling-page-wise-pdf-converter/page_dedup.py
+import hashlib
+import json
+
+# Bump when a format converter changes its output, so pages cached by older versions are not reused
+PAGE_CACHE_VERSION = 2
+
+# Item fields that locate an item in its document rather than describe its content
+_POSITION_FIELDS = {"prov", "self_ref", "parent", "children", "captions", "references", "footnotes"}
+
+
+def _strip_bboxes(value):
+    """
+    Removes bounding boxes (e.g. of table cells) from a dumped item.
+    """
+    if isinstance(value, dict):
+        return {key: _strip_bboxes(item) for key, item in value.items() if key != "bbox"}
+    if isinstance(value, list):
+        return [_strip_bboxes(item) for item in value]
+    return value
+
+
+def _resolve_texts(refs, doc):
+    return [getattr(ref.resolve(doc), "text", None) for ref in refs or []]
+
+
+def page_fingerprint(doc, page_number: int) -> str:
+    """
+    Computes a content hash of a page from its items.
+
+    The hash covers each item's type, nesting level and full field dump (label, text, formatting,
+    hyperlinks, heading levels, list markers, table cells and header flags, picture data) with captions,
+    footnotes and references resolved to their text, but not the page number, item positions or
+    references into the document, so the same boilerplate page hashes identically in every document.
+    """
+    items = []
+    for item, level in doc.iterate_items(page_no=page_number):
+        entry = {
+            "type": item.__class__.__name__,
+            "level": level,
+            "item": _strip_bboxes(item.model_dump(mode="json", exclude=_POSITION_FIELDS)),
+        }
+        if hasattr(item, "captions"):
+            entry["captions"] = _resolve_texts(item.captions, doc)
+            entry["footnotes"] = _resolve_texts(item.footnotes, doc)
+            entry["references"] = _resolve_texts(item.references, doc)
+        items.append(entry)
+    payload = json.dumps([PAGE_CACHE_VERSION, items], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
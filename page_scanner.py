@@ -0,0 +1,138 @@
+# docling-page-wise-pdf-converter/page_scanner.py
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class PageRoute(NamedTuple):
+    """
+    A contiguous range of pages (1-based, inclusive) that goes through the same pipeline.
+    """
+    start: int
+    end: int
+    needs_ocr: bool
+
+
+def _is_usable_text(text: str, min_chars: int, min_printable_ratio: float) -> bool:
+    """
+    Checks if extracted text looks like a real text layer rather than an empty or garbled one.
+    """
+    chars = [c for c in text if not c.isspace()]
+    if len(chars) < min_chars:
+        return False
+    # Broken font encodings show up as replacement, private-use or control characters
+    printable = sum(1 for c in chars if c != '\ufffd' and unicodedata.category(c) not in ("Co", "Cc", "Cs"))
+    return printable / len(chars) >= min_printable_ratio
+
+
+def _image_coverage(page, image_type: int) -> float:
+    """
+    Returns the share of the page area covered by image objects, capped at 1.
+    Overlapping images are counted once each, which only errs towards OCR.
+    """
+    width, height = page.get_size()
+    if width <= 0 or height <= 0:
+        return 0.0
+    covered = 0.0
+    for obj in page.get_objects(filter=[image_type]):
+        left, bottom, right, top = obj.get_pos()
+        covered += max(0.0, min(right, width) - max(left, 0.0)) * max(0.0, min(top, height) - max(bottom, 0.0))
+    return min(covered / (width * height), 1.0)
+
+
+def scan_text_layer(pdf_path: Path, min_chars: int = 50, min_printable_ratio: float = 0.9,
+                    page_range: Optional[Tuple[int, int]] = None, max_image_coverage: float = 0.5) -> Optional[Dict[int, bool]]:
+    """
+    Classifies each page of a local PDF by whether its text layer holds the page's content.
+    Only the text layer and the page objects are read; no page is rendered.
+
+    A scanned page can carry a text layer of its own, such as a Bates number, a stamp or a partial
+    OCR by the scanner, so a page only counts as born-digital if images cover less than
+    max_image_coverage of it as well.
+
+    Args:
+        pdf_path: Path to a local PDF file.
+        min_chars: Minimum number of non-whitespace characters for a page to count as born-digital.
+        min_printable_ratio: Minimum share of those characters that must be printable.
+        page_range: Scans only these pages (1-based, inclusive) instead of the whole file.
+        max_image_coverage: Share of the page area covered by images from which the page is OCRed.
+
+    Returns:
+        A dictionary mapping page numbers to True if the page has a usable text layer,
+        or None if the file could not be scanned.
+    """
+    try:
+        import pypdfium2 as pdfium  # Installed with docling
+        import pypdfium2.raw as pdfium_c
+    except ImportError:
+        return None
+
+    try:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+    except Exception as e:
+        print(f"Warning: Could not pre-scan {pdf_path} for a text layer: {str(e)}")
+        return None
+    try:
+        first, last = page_range if page_range is not None else (1, len(pdf))
+        has_text = {}
+        for index in range(max(first, 1) - 1, min(last, len(pdf))):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                has_text[index + 1] = (_is_usable_text(textpage.get_text_range(), min_chars, min_printable_ratio)
+                                       and _image_coverage(page, pdfium_c.FPDF_PAGEOBJ_IMAGE) < max_image_coverage)
+            finally:
+                textpage.close()
+                page.close()
+        return has_text
+    finally:
+        pdf.close()
+
+
+def count_pages(pdf_path: Path) -> Optional[int]:
+    """
+    Returns the number of pages of a local PDF without parsing their content, or None if it cannot be read.
+    """
+    try:
+        import pypdfium2 as pdfium  # Installed with docling
+    except ImportError:
+        return None
+
+    try:
+        pdf = pdfium.PdfDocument(str(pdf_path))
+    except Exception:
+        return None
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _merge_routes(routes: List[PageRoute]) -> List[PageRoute]:
+    """
+    Joins adjacent routes that go through the same pipeline.
+    """
+    merged: List[PageRoute] = []
+    for route in routes:
+        if merged and merged[-1].needs_ocr == route.needs_ocr and merged[-1].end == route.start - 1:
+            merged[-1] = merged[-1]._replace(end=route.end)
+        else:
+            merged.append(route)
+    return merged
+
+
+def plan_page_routes(has_text: Dict[int, bool], min_text_pages: int = 5) -> List[PageRoute]:
+    """
+    Groups consecutive pages with the same classification into routes, in page order.
+
+    Every route costs a docling call, so a run of fewer than min_text_pages text-layer pages next to
+    an OCR route is folded into it; OCR reads those pages as well, and a document alternating between
+    scanned and born-digital pages would otherwise be converted one page per call.
+    """
+    routes = _merge_routes([PageRoute(page_no, page_no, not has_text[page_no]) for page_no in sorted(has_text)])
+    for i, route in enumerate(routes):
+        neighbours = routes[max(i - 1, 0):i] + routes[i + 1:i + 2]
+        if (not route.needs_ocr and route.end - route.start + 1 < min_text_pages
+                and any(n.needs_ocr and (n.end == route.start - 1 or n.start == route.end + 1) for n in neighbours)):
+            routes[i] = route._replace(needs_ocr=True)
+    return _merge_routes(routes)
@@ -1,5 +1,6 @@
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions
@@ -9,55 +10,163 @@ import sys
 import os
 
 # Change relative imports to absolute imports
+from .batch_journal import BatchJournal
+from .chunker import update_chunk_index
 from .content_manager import ContentManager
-from .format_converters.markdown_converter import MarkdownConverter
-from .format_converters.html_converter import HtmlConverter
-from .format_converters.txt_converter import TxtConverter
-from .format_converters.json_converter import JsonConverter
-from .format_converters.yaml_converter import YamlConverter
-from .format_converters.csv_converter import CsvConverter
-from .format_converters.xml_converter import XmlConverter
+from .page_dedup import page_fingerprint
+from .page_scanner import PageRoute, count_pages, plan_page_routes, scan_text_layer
+from .format_converters import FORMAT_CONVERTERS
+
+
+SUPPORTED_FORMATS = ["markdown", "html", "txt", "json", "yaml", "csv", "xml"]
+
+
+class ConversionCancelled(Exception):
+    """
+    Raised when a conversion stops because its cancel event was set.
+    """
+
+
+def _source_filename(source: str) -> Path:
+    """
+    Creates a filename from URL or uses the local path.
+    """
+    if '://' in source:
+        output_filename = Path(source.split('/')[-1])
+        if not output_filename.suffix:
+            output_filename = Path(f"{output_filename}.pdf")
+        return output_filename
+    return Path(source)
+
+
+def _document_key(source: str) -> str:
+    """
+    Returns a stable identifier for a source, used as the document key in batch journals.
+    """
+    if '://' in source:
+        return source
+    return str(Path(source).resolve())
+
+
+def _journal_unit(journal: BatchJournal, content_manager: ContentManager, document: str, pdf_stem: str, format_name: str,
+                  expected_pages: List[int]) -> bool:
+    """
+    Verifies the saved content of one format and records it in the journal as a completed unit.
+    Returns False if the content file is missing, cannot be decoded or does not hold exactly the expected pages.
+    """
+    pages = sorted(expected_pages)
+    if not content_manager.verify_content(pdf_stem, format_name, pages):
+        return False
+    journal.record_unit(document, format_name, pages, content_manager.content_checksum(pdf_stem, format_name))
+    return True
+
+
+def _pending_formats(journal: BatchJournal, content_manager: ContentManager, document: str, pdf_stem: str, formats: List[str]) -> List[str]:
+    """
+    Returns the formats of a document that are not complete according to the journal.
+    A journaled unit is only complete while its content file matches the recorded checksum and every
+    shared page it references is still in the page cache. Content files of incomplete formats are
+    discarded so that they are converted again.
+    """
+    pending_formats = []
+    page_count = None  # Counted on first use; 0 if the source cannot be counted (e.g. a URL)
+    for format_name in formats:
+        checksum = content_manager.content_checksum(pdf_stem, format_name)
+        if journal.is_unit_complete(document, format_name, checksum):
+            unit = journal.get_unit(document, format_name)
+            if content_manager.verify_content(pdf_stem, format_name, unit["pages"]):
+                continue
+        # A content file without a journal entry was renamed into place by a run that crashed before
+        # journaling it, so it is complete once it verifies against the page count of the source.
+        if journal.get_unit(document, format_name) is None:
+            if page_count is None:
+                page_count = (count_pages(Path(document)) if '://' not in document else None) or 0
+            if page_count and _journal_unit(journal, content_manager, document, pdf_stem, format_name,
+                                             list(range(1, page_count + 1))):
+                continue
+        content_manager.discard_content(pdf_stem, format_name)
+        pending_formats.append(format_name)
+    return pending_formats
+
+
+def _page_range_stem(pdf_stem: str, page_range: Tuple[int, int]) -> str:
+    """
+    Returns the stem under which the content of a page range of a document is saved.
+    """
+    return f"{pdf_stem}.pages{page_range[0]}-{page_range[1]}"
+
+
+def _create_format_converters() -> Dict:
+    """
+    Creates one converter per supported output format.
+    """
+    return {format_name: converter_class() for format_name, converter_class in FORMAT_CONVERTERS.items()}
 
 
 class PdfConverter:
     """
     Converts PDF documents to various formats.
+
+    The source is converted by docling when the first format is converted, not when the converter is
+    created. Every docling call (one per OCR route or page batch) is rendered to all requested formats
+    as soon as it returns, so on_page reports pages while later parts of the source are still converting.
     """
-    def __init__(self, source: str, output_dir: str):
+    def __init__(self, source: str, output_dir: str, journal: Optional[BatchJournal] = None, ocr_routing: bool = True,
+                 dedup_pages: bool = True, cancel_event: Optional[threading.Event] = None,
+                 on_page: Optional[Callable[[str, int, Any], None]] = None, chunk_max_tokens: Optional[int] = 512,
+                 page_range: Optional[Tuple[int, int]] = None, batch_pages: Optional[int] = None):
+        """
+        Args:
+            cancel_event: When set, the conversion stops by raising ConversionCancelled. The event is checked
+                          between docling calls, pages and formats, so a docling call in progress is finished
+                          first; see batch_pages.
+            on_page: Called with (format_name, page_number, content) for every finished page, in page order
+                     per format as each docling call finishes; formats converted together are interleaved.
+            chunk_max_tokens: Token limit of the retrieval chunks built from the Markdown output,
+                              or None to skip chunking.
+            page_range: Converts only these pages (1-based, inclusive). The content is saved under a
+                        separate stem, without format files or chunks, to be merged with the other ranges.
+                        It cannot be combined with a journal; the merged document is journaled instead.
+            batch_pages: Converts a local PDF in docling calls of at most this many pages, so that cancellation
+                         and on_page do not wait for the whole document, or None to convert each OCR route
+                         in one call. A URL is always converted in one call.
+        """
+        if journal is not None and page_range is not None:
+            raise ValueError("A page range conversion cannot be journaled; journal the merged document instead")
+        if batch_pages is not None and batch_pages < 1:
+            raise ValueError("batch_pages must be at least 1")
         self.source = source
         self.output_dir = Path(output_dir)
-        # Create a filename from URL or use local path
-        if '://' in source:
-            self.output_filename = Path(source.split('/')[-1])
-            if not self.output_filename.suffix:
-                self.output_filename = Path(f"{self.output_filename}.pdf")
-        else:
-            self.output_filename = Path(source)
-        
-        self.pdf_stem = self.output_filename.stem
+        self.output_filename = _source_filename(source)
+        self.page_range = page_range
+        self.pdf_stem = self.output_filename.stem if page_range is None else _page_range_stem(self.output_filename.stem, page_range)
         self.images_dir = self.output_dir / "images"
         self.content_manager = ContentManager(self.output_dir)
-        self.converter = self._initialize_converter()
-        # Direct conversion from source (works with both URLs and local files)
-        self.result = self.converter.convert(source)
-        self.doc = self.result.document
-        self.format_converters = {
-            "markdown": MarkdownConverter(),
-            "html": HtmlConverter(),
-            "txt": TxtConverter(),
-            "json": JsonConverter(),
-            "yaml": YamlConverter(),
-            "csv": CsvConverter(),
-            "xml": XmlConverter(),
-        }
-
-    def _initialize_converter(self):
+        self.journal = journal
+        self.cancel_event = cancel_event
+        self.batch_pages = batch_pages
+        self.on_page = on_page
+        self.ocr_routing = ocr_routing
+        self.dedup_pages = dedup_pages
+        self.chunk_max_tokens = chunk_max_tokens
+        self.dedup_stats: Dict[str, int] = {}  # Pages reused from the page cache, per format
+        self._page_hashes: Dict[int, str] = {}
+        self._document_converters = {}
+        self._conversion_plan: Optional[List[Tuple[bool, Optional[Tuple[int, int]]]]] = None
+        # Converted documents in page order, one per docling call (see _iter_documents)
+        self.documents: List = []
+        self.format_converters = _create_format_converters()
+
+    def _initialize_converter(self, do_ocr: bool = True):
         """
         Initializes the DocumentConverter with PDF pipeline options.
+        With do_ocr=False it builds the text-layer fast path, which does not OCR or keep full page images;
+        picture crops are still generated, so export_images covers pictures on born-digital pages.
         """
         pipeline_options = PdfPipelineOptions()
+        pipeline_options.do_ocr = do_ocr
         pipeline_options.images_scale = 2.0
-        pipeline_options.generate_page_images = True
+        pipeline_options.generate_page_images = do_ocr
         pipeline_options.generate_picture_images = True
         return DocumentConverter(
             format_options={
@@ -65,24 +174,241 @@ class PdfConverter:
             }
         )
 
-    def _convert_and_save_format(self, format_name: str):
+    def _get_document_converter(self, do_ocr: bool):
         """
-        Converts the PDF to the specified format and saves the content.
+        Returns the DocumentConverter for a pipeline, creating it on first use.
         """
-        if self.content_manager.has_content(self.pdf_stem, format_name):
-            print(f"Content for {format_name} already exists. Skipping conversion.")
-            return
+        if do_ocr not in self._document_converters:
+            self._document_converters[do_ocr] = self._initialize_converter(do_ocr)
+        return self._document_converters[do_ocr]
+
+    def _plan_routes(self) -> Optional[List[PageRoute]]:
+        """
+        Pre-scans a local PDF, or only its page range, and groups its pages into OCR and text-layer routes.
+        Returns None if the source cannot be scanned (e.g. a URL), in which case every page is OCRed.
+        """
+        if '://' in self.source:
+            return None
+        has_text = scan_text_layer(Path(self.source), page_range=self.page_range)
+        if not has_text:
+            return None
+        return plan_page_routes(has_text)
+
+    def _plan_conversion(self) -> List[Tuple[bool, Optional[Tuple[int, int]]]]:
+        """
+        Plans the docling calls that convert the source, in page order, as (do_ocr, page_range) pairs.
+        With OCR routing, born-digital pages go through the text-layer fast path and only pages
+        without a usable text layer are rasterized and OCRed. With batch_pages, each route is
+        converted in batches of that many pages.
+        """
+        routes = self._plan_routes() if self.ocr_routing else None
+        routed = routes is not None
+        if routes is None:
+            # A batched conversion needs the page count to convert the source in batches
+            page_count = count_pages(Path(self.source)) if self.batch_pages is not None and '://' not in self.source else None
+            if not page_count:
+                # Direct conversion from source (works with both URLs and local files)
+                return [(True, self.page_range)]
+            routes = [PageRoute(1, page_count, True)]
+
+        if self.page_range is not None:
+            start, end = self.page_range
+            routes = [route._replace(start=max(route.start, start), end=min(route.end, end))
+                      for route in routes if route.end >= start and route.start <= end]
+            if not routes:
+                raise ValueError(f"Page range {start}-{end} is outside of {self.source}")
+        if routed:
+            page_count = sum(route.end - route.start + 1 for route in routes)
+            ocr_pages = sum(route.end - route.start + 1 for route in routes if route.needs_ocr)
+            print(f"OCR routing for {self.pdf_stem}: {ocr_pages} of {page_count} pages need OCR.")
+
+        plan = []
+        for route in routes:
+            start = route.start
+            while start <= route.end:
+                end = route.end if self.batch_pages is None else min(start + self.batch_pages - 1, route.end)
+                plan.append((route.needs_ocr, (start, end)))
+                start = end + 1
+        return plan
+
+    def _iter_documents(self) -> Iterator:
+        """
+        Yields the documents of the source in page order, converting each on first use.
+        """
+        if self._conversion_plan is None:
+            self._conversion_plan = self._plan_conversion()
+        for index, (do_ocr, page_range) in enumerate(self._conversion_plan):
+            if index == len(self.documents):
+                self._check_cancelled()
+                self.documents.append(self._convert_pages(do_ocr, page_range))
+            yield self.documents[index]
+
+    def _is_converted(self) -> bool:
+        """
+        Checks if every planned docling call has been made.
+        """
+        return self._conversion_plan is not None and len(self.documents) == len(self._conversion_plan)
+
+    def _expected_pages(self) -> List[int]:
+        """
+        Returns the page numbers of the source, or of its page range. A local source that has not been
+        converted, because all requested formats were saved before, is counted instead of converted.
+        """
+        if not self._is_converted() and '://' not in self.source:
+            page_count = count_pages(Path(self.source))
+            if page_count:
+                first, last = self.page_range or (1, page_count)
+                return list(range(max(first, 1), min(last, page_count) + 1))
+        return sorted(page_number for doc in self._iter_documents() for page_number in doc.pages.keys())
 
-        if format_name not in self.format_converters:
-            raise ValueError(f"Unsupported output format: {format_name}")
+    def _convert_pages(self, do_ocr: bool, page_range: Optional[Tuple[int, int]]):
+        """
+        Converts the source, or only a page range of it, with the OCR or the text-layer pipeline.
+        """
+        converter = self._get_document_converter(do_ocr)
+        if page_range is None:
+            return converter.convert(self.source).document
+        return converter.convert(self.source, page_range=page_range).document
+
+    def _render_document(self, format_name: str, doc, page_contents: Dict, page_refs: Dict[int, str]) -> int:
+        """
+        Runs a format converter over the pages of one document, adding them to page_contents.
 
+        With page deduplication, a page whose content hash is already in the page cache reuses the
+        cached output, relabelled for its page number, instead of being converted again, and a newly
+        converted page is added to the cache. Every page's hash is added to page_refs, which the content
+        file references instead of storing the content again; loading it relabels the shared copy.
+        Returns the number of pages reused from the page cache.
+        """
         converter = self.format_converters[format_name]
-        page_contents = converter.convert_to_format(self.doc, self.output_filename, self.output_dir)
-        self.content_manager.save_content(self.pdf_stem, format_name, page_contents)
+        converted = {}  # Output of a converter that converts whole documents
+        reused = 0
+        for page_number in doc.pages.keys():
+            self._check_cancelled()
+            if not self.dedup_pages:
+                page_contents[page_number] = self._convert_page(converter, doc, page_number, converted)
+                self._emit_page(format_name, page_number, page_contents[page_number])
+                continue
+            if page_number not in self._page_hashes:
+                self._page_hashes[page_number] = page_fingerprint(doc, page_number)
+            page_hash = self._page_hashes[page_number]
+            shared = self.content_manager.load_shared_page(page_hash, format_name)
+            if shared is None:
+                content = self._convert_page(converter, doc, page_number, converted)
+                # A concurrent conversion may have cached the page first; its copy is relabelled on load
+                self.content_manager.save_shared_page(page_hash, format_name, content, page_number)
+            else:
+                shared_content, shared_page = shared
+                content = shared_content if shared_page == page_number else converter.relabel_page(shared_content, page_number)
+                reused += 1
+            page_contents[page_number] = content
+            page_refs[page_number] = page_hash
+            self._emit_page(format_name, page_number, content)
+        return reused
+
+    def _convert_page(self, converter, doc, page_number: int, converted: Dict):
+        """
+        Converts one page with a format converter. A converter that overrides convert_to_format converts
+        the whole document into converted on the first call, and later pages of the document are taken from it.
+        """
+        if not converter.converts_whole_documents():
+            return converter.convert_page(doc, page_number)
+        if not converted:
+            converted.update(converter.convert_to_format(doc, self.output_filename, self.output_dir))
+        return converted[page_number]
+
+    def _check_cancelled(self):
+        """
+        Raises ConversionCancelled if the cancel event has been set.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ConversionCancelled(f"Conversion of {self.source} was cancelled.")
+
+    def _emit_page(self, format_name: str, page_number: int, content):
+        """
+        Reports a finished page to the on_page callback, if one is set.
+        """
+        if self.on_page is not None:
+            self.on_page(format_name, page_number, content)
 
-        # Save with original extension if applicable and desired (e.g., for markdown, html, txt, xml, csv, yaml)
-        if format_name in ["markdown", "html", "txt", "json", "yaml", "csv", "xml"]:
-            converter.save_with_original_extension(page_contents, self.output_filename, self.output_dir, self.doc) # Pass self.doc here
+    def _whole_document(self):
+        """
+        Returns the docling document of the whole source, or None if it was converted in several parts.
+        """
+        return self.documents[0] if len(self.documents) == 1 else None
+
+    def _reuse_saved_format(self, format_name: str):
+        """
+        Journals, reports and chunks the content of a format that was saved by an earlier conversion.
+        """
+        print(f"Content for {format_name} already exists. Skipping conversion.")
+        self._record_unit(format_name)
+        if self.on_page is not None:
+            for page_number, content in (self.content_manager.load_content(self.pdf_stem, format_name) or {}).items():
+                self._emit_page(format_name, page_number, content)
+        self._update_chunks(format_name)
+
+    def _save_format(self, format_name: str, page_contents: Dict, page_refs: Dict[int, str]):
+        """
+        Saves the rendered pages of a format.
+        """
+        converter = self.format_converters[format_name]
+        # Save with original extension if applicable and desired (e.g., for markdown, html, txt, xml, csv, yaml).
+        # This happens before the content file is saved, so an existing content file implies a complete export.
+        if format_name in SUPPORTED_FORMATS and self.page_range is None:
+            converter.save_with_original_extension(page_contents, self.output_filename, self.output_dir, self._whole_document())
+        self.content_manager.save_content(self.pdf_stem, format_name, page_contents, page_refs)
+        self._record_unit(format_name)
+        self._update_chunks(format_name, page_contents)
+
+    def convert_formats(self, format_names: Iterable[str]):
+        """
+        Converts the PDF to several formats at once, so each docling document is rendered to every
+        format as soon as it is converted. Formats whose content was saved before are not converted again.
+        """
+        pending_formats = []
+        for format_name in format_names:
+            self._check_cancelled()
+            if self.content_manager.has_content(self.pdf_stem, format_name):
+                self._reuse_saved_format(format_name)
+            elif format_name not in self.format_converters:
+                raise ValueError(f"Unsupported output format: {format_name}")
+            else:
+                pending_formats.append(format_name)
+        if not pending_formats:
+            return
+
+        rendered = {format_name: ({}, {}) for format_name in pending_formats}  # Page contents and refs
+        reused = dict.fromkeys(pending_formats, 0)
+        for doc in self._iter_documents():
+            for format_name in pending_formats:
+                reused[format_name] += self._render_document(format_name, doc, *rendered[format_name])
+
+        for format_name in pending_formats:
+            page_contents, page_refs = rendered[format_name]
+            if self.dedup_pages:
+                self.dedup_stats[format_name] = reused[format_name]
+                print(f"Deduplicated {reused[format_name]} of {len(page_contents)} pages for {format_name}.")
+            self._check_cancelled()
+            self._save_format(format_name, dict(sorted(page_contents.items())), page_refs)
+
+    def _update_chunks(self, format_name: str, page_contents: Optional[Dict[int, str]] = None):
+        """
+        Builds or incrementally rebuilds the retrieval chunk index once the Markdown content is saved.
+        """
+        if format_name != "markdown" or self.chunk_max_tokens is None or self.page_range is not None:
+            return
+        update_chunk_index(self.content_manager, self.pdf_stem, page_contents, self.chunk_max_tokens)
+
+    def _record_unit(self, format_name: str):
+        """
+        Records the saved content of a format in the batch journal, if one is attached.
+        """
+        if self.journal is None:
+            return
+        if not _journal_unit(self.journal, self.content_manager, _document_key(self.source), self.pdf_stem, format_name,
+                             self._expected_pages()):
+            print(f"Warning: Content for {format_name} of {self.pdf_stem} failed verification and was not journaled.")
 
     def export_images(self) -> List[Path]:
         """Exports images from the document."""
@@ -92,39 +418,41 @@ class PdfConverter:
             image_paths = []
 
             # Export page images
-            for page_no, page in self.doc.pages.items():
-                try:
-                    if hasattr(page, 'image') and page.image and hasattr(page.image, 'pil_image'):
-                        image_path = self.images_dir / f"{doc_filename}_page_{page_no}.png"
-                        page.image.pil_image.save(image_path, format="PNG")
-                        image_paths.append(image_path)
-                except Exception as e:
-                    print(f"Warning: Failed to save page {page_no} image: {str(e)}")
+            for doc in self._iter_documents():
+                for page_no, page in doc.pages.items():
+                    try:
+                        if hasattr(page, 'image') and page.image and hasattr(page.image, 'pil_image'):
+                            image_path = self.images_dir / f"{doc_filename}_page_{page_no}.png"
+                            page.image.pil_image.save(image_path, format="PNG")
+                            image_paths.append(image_path)
+                    except Exception as e:
+                        print(f"Warning: Failed to save page {page_no} image: {str(e)}")
 
             # Export figures and tables
             table_counter = picture_counter = 0
 
-            for element, _ in self.doc.iterate_items():
-                try:
-                    if isinstance(element, TableItem) and hasattr(element, 'get_image'):
-                        table_counter += 1
-                        page_no = element.prov[0].page_no if element.prov else 0
-                        image_path = self.images_dir / f"{doc_filename}_page_{page_no}_table_{table_counter}.png"
-                        table_image = element.get_image(self.doc)
-                        if table_image:
-                            table_image.save(image_path, "PNG")
-                            image_paths.append(image_path)
+            for doc in self._iter_documents():
+                for element, _ in doc.iterate_items():
+                    try:
+                        if isinstance(element, TableItem) and hasattr(element, 'get_image'):
+                            table_counter += 1
+                            page_no = element.prov[0].page_no if element.prov else 0
+                            image_path = self.images_dir / f"{doc_filename}_page_{page_no}_table_{table_counter}.png"
+                            table_image = element.get_image(doc)
+                            if table_image:
+                                table_image.save(image_path, "PNG")
+                                image_paths.append(image_path)
 
-                    if isinstance(element, PictureItem) and hasattr(element, 'get_image'):
-                        picture_counter += 1
-                        page_no = element.prov[0].page_no if element.prov else 0
-                        image_path = self.images_dir / f"{doc_filename}_page_{page_no}_picture_{picture_counter}.png"
-                        picture_image = element.get_image(self.doc)
-                        if picture_image:
-                            picture_image.save(image_path, "PNG")
-                            image_paths.append(image_path)
-                except Exception as e:
-                    print(f"Warning: Failed to save element image: {str(e)}")
+                        if isinstance(element, PictureItem) and hasattr(element, 'get_image'):
+                            picture_counter += 1
+                            page_no = element.prov[0].page_no if element.prov else 0
+                            image_path = self.images_dir / f"{doc_filename}_page_{page_no}_picture_{picture_counter}.png"
+                            picture_image = element.get_image(doc)
+                            if picture_image:
+                                picture_image.save(image_path, "PNG")
+                                image_paths.append(image_path)
+                    except Exception as e:
+                        print(f"Warning: Failed to save element image: {str(e)}")
 
             return image_paths
         except Exception as e:
@@ -135,13 +463,12 @@ class PdfConverter:
     def convert_all(self):
         """Converts PDF to all supported formats and exports images."""
         # self.export_images()
-        for format_name in self.format_converters:
-            self._convert_and_save_format(format_name)
+        self.convert_formats(self.format_converters)
 
     def convert_to_format(self, output_format: str):
         """Converts PDF to the specified format and exports images."""
         # self.export_images() # Commented out to avoid exporting images multiple times
-        self._convert_and_save_format(output_format)
+        self.convert_formats([output_format])
 
     def get_page_content(self, output_format: str, page: int) -> Optional[str]:
         """
@@ -150,7 +477,8 @@ class PdfConverter:
         return self.content_manager.get_page_content_plain_text(self.pdf_stem, output_format, page)
 
 
-def convert_pdf(source: str, output_dir: str, output_format: str = "all"):
+def convert_pdf(source: str, output_dir: str, output_format: str = "all", ocr_routing: bool = True, dedup_pages: bool = True,
+                chunk_max_tokens: Optional[int] = 512):
     """
     Converts PDF to multiple formats and export images.
     Args:
@@ -158,17 +486,69 @@ def convert_pdf(source: str, output_dir: str, output_format: str = "all"):
         output_dir: Directory for output files
         output_format: The desired output format (e.g., "markdown", "html", "txt", "json", "yaml", "csv", "xml", or "all").
                        Defaults to "all".
+        ocr_routing: If True, only pages of a local PDF without a usable text layer are rasterized and OCRed.
+                     Defaults to True.
+        dedup_pages: If True, pages already converted in output_dir (in this or another document) are reused
+                     from the shared page cache instead of being converted again. Defaults to True.
+        chunk_max_tokens: Token limit of the retrieval chunks saved to "<stem>.chunks.json" when Markdown is
+                          converted, or None to skip chunking. Defaults to 512.
     """
     output_dir_path = Path(output_dir)
     output_dir_path.mkdir(parents=True, exist_ok=True)
 
-    converter = PdfConverter(source, output_dir)
+    converter = PdfConverter(source, output_dir, ocr_routing=ocr_routing, dedup_pages=dedup_pages,
+                             chunk_max_tokens=chunk_max_tokens)
     if output_format == "all":
         converter.convert_all()
     else:
         converter.convert_to_format(output_format)
 
 
+def convert_batch(sources: Iterable[str], output_dir: str, output_format: str = "all", journal_path: Optional[str] = None,
+                  ocr_routing: bool = True, dedup_pages: bool = True, chunk_max_tokens: Optional[int] = 512,
+                  cancel_event: Optional[threading.Event] = None):
+    """
+    Converts several PDFs into one output directory and can be resumed after a crash.
+
+    Every (document, format) unit that is saved and verified is recorded in a journal. Running the
+    same batch again converts only the units that are missing from the journal or whose content
+    file no longer matches its recorded checksum; documents whose units are all complete are not
+    converted again.
+
+    Args:
+        sources: Paths to the input PDF files or URLs
+        output_dir: Directory for output files
+        output_format: The desired output format (see convert_pdf). Defaults to "all".
+        journal_path: Path to the batch journal. Defaults to ".batch_journal.jsonl" in output_dir.
+        ocr_routing: See convert_pdf. Defaults to True.
+        dedup_pages: See convert_pdf. Defaults to True.
+        chunk_max_tokens: See convert_pdf. Defaults to 512.
+        cancel_event: When set, the batch stops by raising ConversionCancelled (see PdfConverter).
+                      Units completed before that stay journaled.
+    """
+    output_dir_path = Path(output_dir)
+    output_dir_path.mkdir(parents=True, exist_ok=True)
+    journal = BatchJournal(Path(journal_path) if journal_path else output_dir_path / ".batch_journal.jsonl")
+    content_manager = ContentManager(output_dir_path)
+    formats = SUPPORTED_FORMATS if output_format == "all" else [output_format]
+    deduplicated_pages = 0
+
+    for source in sources:
+        document = _document_key(source)
+        pdf_stem = _source_filename(source).stem
+        pending_formats = _pending_formats(journal, content_manager, document, pdf_stem, formats)
+        if not pending_formats:
+            print(f"All formats for {pdf_stem} are complete. Skipping conversion.")
+            continue
+
+        converter = PdfConverter(source, output_dir, journal=journal, ocr_routing=ocr_routing, dedup_pages=dedup_pages,
+                                 cancel_event=cancel_event, chunk_max_tokens=chunk_max_tokens)
+        converter.convert_formats(pending_formats)
+        deduplicated_pages += sum(converter.dedup_stats.values())
+
+    print(f"Batch complete: {deduplicated_pages} page conversions were deduplicated.")
+
+
 # Example usage:
 if __name__ == "__main__":
     pdf_file = "https://www.kvgportal.com/W_global/Media/lexcom/VN/A14870/A148703540-2.pdf"  # Replace with your PDF file path
@@ -0,0 +1,340 @@
+# docling-page-wise-pdf-converter/sharded_batch.py
+import argparse
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .batch_scheduler import TimingHistory, plan_batch
+from .content_manager import atomic_write_json
+from .pdf_converter import ConversionCancelled, _document_key, convert_batch
+
+
+def write_manifest(manifest_path: str, sources: List[str], largest_first: bool = False, output_dir: Optional[str] = None,
+                   history_path: Optional[str] = None):
+    """
+    Writes the shared manifest listing the documents of a sharded batch.
+    Workers claim documents in manifest order, so with largest_first the documents estimated to take
+    longest (by page count, file size and timing history) are started first and small ones fill in at the end.
+    The timing history defaults to ".timing_history.json" in output_dir, the one run_scheduled_batch keeps.
+    """
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    if largest_first:
+        if history_path is None and output_dir is not None:
+            history_path = Path(output_dir) / ".timing_history.json"
+        jobs, _ = plan_batch(sources, history=TimingHistory(history_path), split_pages=False)
+        sources = [job.source for job in jobs]
+    atomic_write_json(manifest_path, {"documents": list(sources)})
+
+
+def load_manifest(manifest_path: str) -> List[str]:
+    """
+    Loads the document sources listed in a manifest.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)["documents"]
+
+
+class ShardWorker:
+    """
+    Converts documents from a shared manifest, coordinating with other workers through lease files.
+
+    Workers may run on any number of hosts as long as they share the manifest and output directories.
+    For each document a worker creates an exclusive lease file, refreshes its modification time from a
+    heartbeat thread while converting, and writes a done marker when the document is complete. A lease
+    whose heartbeat is older than lease_timeout is treated as abandoned and can be reclaimed by any
+    worker. A worker that loses its lease stops converting at the next page or format boundary.
+    Completed formats of a reclaimed document are kept through a per-document batch journal,
+    so only unfinished work is redone. Expiry compares lease mtimes with the local clock, so hosts
+    should keep their clocks synchronized to well within lease_timeout.
+
+    A document whose conversion raises is recorded in a failure marker and released for another
+    attempt; after max_attempts failures it is no longer claimed and the workers carry on with
+    the rest of the manifest.
+    """
+    def __init__(self, manifest_path: str, output_dir: str, output_format: str = "all",
+                 worker_id: Optional[str] = None, lease_dir: Optional[str] = None,
+                 lease_timeout: float = 300.0, heartbeat_interval: float = 30.0, poll_interval: float = 10.0,
+                 max_attempts: int = 3):
+        if heartbeat_interval >= lease_timeout:
+            raise ValueError("heartbeat_interval must be shorter than lease_timeout")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.manifest_path = Path(manifest_path)
+        self.output_dir = Path(output_dir)
+        self.output_format = output_format
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_dir = Path(lease_dir) if lease_dir else self.manifest_path.parent / f"{self.manifest_path.stem}.leases"
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.failed: Dict[str, str] = {}  # Documents given up on, with their last error; set by run()
+
+    def _document_id(self, source: str) -> str:
+        """
+        Returns the file name prefix used for a document's lease, done marker and journal.
+        """
+        return hashlib.sha1(_document_key(source).encode('utf-8')).hexdigest()[:16]
+
+    def _lease_path(self, doc_id: str) -> Path:
+        return self.lease_dir / f"{doc_id}.lease"
+
+    def _done_path(self, doc_id: str) -> Path:
+        return self.lease_dir / f"{doc_id}.done"
+
+    def _journal_path(self, doc_id: str) -> Path:
+        return self.lease_dir / f"{doc_id}.journal.jsonl"
+
+    def _failed_path(self, doc_id: str) -> Path:
+        return self.lease_dir / f"{doc_id}.failed"
+
+    def _read_json(self, path: Path) -> Optional[Dict]:
+        """
+        Reads a lease or marker file, returning None if it is missing or not yet fully written.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _read_failures(self, doc_id: str) -> Optional[Dict]:
+        """
+        Reads the failure marker of a document, returning None if it has not failed.
+        """
+        return self._read_json(self._failed_path(doc_id))
+
+    def _is_given_up(self, doc_id: str) -> bool:
+        failures = self._read_failures(doc_id)
+        return failures is not None and failures.get("attempts", 0) >= self.max_attempts
+
+    def _record_failure(self, source: str, doc_id: str, error: Exception):
+        """
+        Counts a failed attempt in the document's failure marker. Only the lease holder writes it.
+        """
+        failures = self._read_failures(doc_id) or {"document": source, "attempts": 0}
+        failures.update({
+            "attempts": failures["attempts"] + 1,
+            "error": f"{type(error).__name__}: {error}",
+            "worker": self.worker_id,
+            "time": time.time(),
+        })
+        atomic_write_json(self._failed_path(doc_id), failures)
+        print(f"Warning: Converting {source} failed (attempt {failures['attempts']} of {self.max_attempts}): {failures['error']}")
+
+    @contextmanager
+    def _lease_lock(self, doc_id: str):
+        """
+        Serializes the removal of a document's lease between workers.
+
+        Leases are only ever created with O_EXCL and only removed while holding this lock, so a lease
+        that a worker has checked under the lock cannot be replaced by a new one before it is removed.
+        The lock is held for milliseconds; one left behind by a crashed worker is broken after lease_timeout.
+        """
+        lock_path = self.lease_dir / f"{doc_id}.lock"
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                if self._is_expired(lock_path):
+                    lock_path.unlink(missing_ok=True)
+                else:
+                    time.sleep(0.01)
+        try:
+            yield
+        finally:
+            lock_path.unlink(missing_ok=True)
+
+    def _is_expired(self, lease_path: Path) -> bool:
+        """
+        Checks if a lease has not been refreshed within lease_timeout.
+        """
+        try:
+            return time.time() - lease_path.stat().st_mtime > self.lease_timeout
+        except FileNotFoundError:
+            return False
+
+    def _try_claim(self, source: str, doc_id: str) -> Optional[str]:
+        """
+        Tries to take the lease for a document. Returns the lease token on success.
+        """
+        lease_path = self._lease_path(doc_id)
+        if lease_path.exists() and self._is_expired(lease_path):
+            self._reclaim(doc_id)
+
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"worker": self.worker_id, "token": token, "document": source, "claimed": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The document may have been completed or given up on between the checks and the claim
+        if self._done_path(doc_id).exists() or self._is_given_up(doc_id):
+            self._release(doc_id, token)
+            return None
+        return token
+
+    def _reclaim(self, doc_id: str):
+        """
+        Removes an expired lease so that it can be claimed again.
+        """
+        lease_path = self._lease_path(doc_id)
+        with self._lease_lock(doc_id):
+            # Checked again under the lock: another worker may have reclaimed and re-claimed it meanwhile
+            if not self._is_expired(lease_path):
+                return
+            lease = self._read_json(lease_path)
+            lease_path.unlink(missing_ok=True)
+        print(f"Reclaimed expired lease {lease_path.name}" + (f" from {lease['worker']}" if lease else ""))
+
+    def _owns_lease(self, doc_id: str, token: str) -> bool:
+        lease = self._read_json(self._lease_path(doc_id))
+        return lease is not None and lease.get("token") == token
+
+    def _release(self, doc_id: str, token: str):
+        """
+        Deletes a lease if it is still held by this worker.
+        """
+        with self._lease_lock(doc_id):
+            if self._owns_lease(doc_id, token):
+                self._lease_path(doc_id).unlink(missing_ok=True)
+
+    def _heartbeat(self, doc_id: str, token: str, stop: threading.Event, lost: threading.Event):
+        """
+        Refreshes the lease until stopped, setting lost if another worker has taken it over.
+        lost is the conversion's cancel event, so losing the lease stops the conversion.
+        """
+        lease_path = self._lease_path(doc_id)
+        while not stop.wait(self.heartbeat_interval):
+            if not self._owns_lease(doc_id, token):
+                lost.set()
+                return
+            try:
+                os.utime(lease_path)
+            except FileNotFoundError:
+                lost.set()
+                return
+
+    def _process_document(self, source: str, doc_id: str, token: str) -> bool:
+        """
+        Converts a claimed document while holding its lease. Returns True if this worker completed it.
+        """
+        stop, lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(doc_id, token, stop, lost), daemon=True)
+        heartbeat.start()
+        try:
+            convert_batch([source], str(self.output_dir), self.output_format, journal_path=str(self._journal_path(doc_id)),
+                          cancel_event=lost)
+        except ConversionCancelled:
+            pass
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if lost.is_set() or not self._owns_lease(doc_id, token):
+            print(f"Warning: Lost the lease for {source} while converting; leaving completion to its new holder.")
+            return False
+        try:
+            fd = os.open(self._done_path(doc_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self._release(doc_id, token)
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"worker": self.worker_id, "document": source, "completed": time.time()}, f)
+        self._release(doc_id, token)
+        return True
+
+    def run(self) -> List[str]:
+        """
+        Claims and converts documents until every document in the manifest is done or given up on.
+        Returns the sources converted by this worker; documents given up on are reported and left in failed.
+        """
+        sources = load_manifest(str(self.manifest_path))
+        doc_ids = {source: self._document_id(source) for source in sources}
+        converted = []
+        while True:
+            remaining = [source for source in sources
+                         if not self._done_path(doc_ids[source]).exists() and not self._is_given_up(doc_ids[source])]
+            if not remaining:
+                break
+            claimed_any = False
+            for source in remaining:
+                doc_id = doc_ids[source]
+                if self._done_path(doc_id).exists():
+                    continue
+                token = self._try_claim(source, doc_id)
+                if token is None:
+                    continue
+                claimed_any = True
+                print(f"Worker {self.worker_id} converting {source}")
+                try:
+                    completed = self._process_document(source, doc_id, token)
+                except Exception as e:
+                    if self._owns_lease(doc_id, token):
+                        self._record_failure(source, doc_id, e)
+                    self._release(doc_id, token)
+                    continue
+                if completed:
+                    converted.append(source)
+            if not claimed_any:
+                # Every remaining document is leased by another worker; wait for completion or expiry
+                time.sleep(self.poll_interval)
+
+        self.failed = {
+            source: (self._read_failures(doc_ids[source]) or {}).get("error")
+            for source in sources if not self._done_path(doc_ids[source]).exists()
+        }
+        if self.failed:
+            print(f"Warning: Gave up on {len(self.failed)} document(s) after {self.max_attempts} failed attempts: "
+                  + ", ".join(self.failed))
+        return converted
+
+
+def run_shard_worker(manifest_path: str, output_dir: str, output_format: str = "all", **kwargs) -> List[str]:
+    """
+    Runs one sharded batch worker against a shared manifest.
+    Start it on as many hosts or processes as needed; each document is converted by one of them.
+
+    Args:
+        manifest_path: Path to the shared manifest written by write_manifest
+        output_dir: Shared directory for output files
+        output_format: The desired output format (see convert_pdf). Defaults to "all".
+        **kwargs: Further ShardWorker options (worker_id, lease_dir, lease_timeout, heartbeat_interval, poll_interval,
+                  max_attempts)
+    """
+    return ShardWorker(manifest_path, output_dir, output_format, **kwargs).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a sharded batch worker against a shared manifest.")
+    parser.add_argument("manifest", help="Shared manifest file")
+    parser.add_argument("output_dir", help="Shared output directory")
+    parser.add_argument("--format", default="all", help="Output format (default: all)")
+    parser.add_argument("--sources", nargs="*", help="Write the manifest with these sources before starting")
+    parser.add_argument("--largest-first", action="store_true", help="Order the written manifest by estimated size")
+    parser.add_argument("--history", help="Timing history for --largest-first (default: .timing_history.json in output_dir)")
+    parser.add_argument("--lease-timeout", type=float, default=300.0)
+    parser.add_argument("--heartbeat-interval", type=float, default=30.0)
+    parser.add_argument("--max-attempts", type=int, default=3, help="Failed attempts before a document is given up on")
+    args = parser.parse_args()
+
+    if args.sources:
+        write_manifest(args.manifest, args.sources, largest_first=args.largest_first, output_dir=args.output_dir,
+                       history_path=args.history)
+    done = run_shard_worker(args.manifest, args.output_dir, args.format, lease_timeout=args.lease_timeout,
+                            heartbeat_interval=args.heartbeat_interval, max_attempts=args.max_attempts)
+    print(f"Converted {len(done)} document(s).")
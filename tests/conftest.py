@@ -0,0 +1,24 @@
+"""
+Loads the package from the repository with docling, pypdfium2 and bs4 replaced by the stubs in support.py.
+"""
+import pytest
+
+import support
+
+support.install_stubs()
+support.load_package()
+
+
+@pytest.fixture
+def conversions(tmp_path, monkeypatch):
+    """
+    Returns a function that lists the stubbed docling conversions so far as (file name, pages, mode) tuples.
+    """
+    log_path = tmp_path / "conversions.log"
+    monkeypatch.setenv("STUB_DOCLING_LOG", str(log_path))
+
+    def read():
+        if not log_path.exists():
+            return []
+        return [tuple(line.split()[1:]) for line in log_path.read_text().splitlines()]
+    return read
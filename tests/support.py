@@ -0,0 +1,306 @@
+"""
+Test support: stand-ins for docling and pypdfium2, and loading of the package from the repository.
+
+The stubs read "PDFs" that are JSON descriptions written by write_pdf, so the tests exercise the
+converter without parsing or OCRing a real file. They replace the real libraries even if those are
+installed, so the tests behave the same everywhere.
+"""
+import importlib.util
+import json
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+PACKAGE = "docling_page_wise_pdf_converter"
+PAGE_SIZE = (612.0, 792.0)
+
+
+def write_pdf(path, pages, error=None):
+    """
+    Writes a fake PDF. Each page is a dict with "items" (dicts with "type" text, section_header or picture,
+    "text", and "level" or "caption"), and optionally "text_layer" and "image_coverage" for the pre-scan.
+    A text layer defaults to the page's text.
+    """
+    path = Path(path)
+    path.write_text(json.dumps({"pages": pages, "error": error}), encoding="utf-8")
+    return str(path)
+
+
+def text_page(*texts, **fields):
+    """
+    Returns a fake PDF page with one text item per text.
+    """
+    return {"items": [{"type": "text", "text": text} for text in texts], **fields}
+
+
+def read_pdf(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# --- docling_core -------------------------------------------------------------------------------------
+
+class _Ref:
+    def __init__(self, item):
+        self.item = item
+
+    def resolve(self, doc):
+        return self.item
+
+
+class _Prov:
+    def __init__(self, page_no):
+        self.page_no = page_no
+
+
+class DocItem:
+    def __init__(self, page_no, label, **fields):
+        self.label = label
+        self.prov = [_Prov(page_no)]
+        self.self_ref = f"#/items/{id(self)}"
+        self.parent = None
+        self.children = []
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def model_dump(self, mode="python", exclude=None):
+        exclude = exclude or set()
+        return {name: value for name, value in vars(self).items() if name not in exclude}
+
+
+class TextItem(DocItem):
+    def __init__(self, page_no, text, label="text", **fields):
+        super().__init__(page_no, label, text=text, orig=text, formatting=None, hyperlink=None, **fields)
+
+
+class SectionHeaderItem(TextItem):
+    def __init__(self, page_no, text, level=1):
+        super().__init__(page_no, text, label="section_header", level=level)
+
+
+class FloatingItem(DocItem):
+    def __init__(self, page_no, label, caption=None):
+        captions = [_Ref(TextItem(page_no, caption, label="caption"))] if caption else []
+        super().__init__(page_no, label, captions=captions, footnotes=[], references=[], image=None)
+
+    def caption_text(self, doc):
+        return "".join(ref.resolve(doc).text for ref in self.captions)
+
+    def get_image(self, doc):
+        return None
+
+
+class TableItem(FloatingItem):
+    def __init__(self, page_no, caption=None):
+        super().__init__(page_no, "table", caption)
+
+
+class PictureItem(FloatingItem):
+    def __init__(self, page_no, caption=None):
+        super().__init__(page_no, "picture", caption)
+
+
+class ImageRefMode:
+    PLACEHOLDER = "placeholder"
+    EMBEDDED = "embedded"
+
+
+class _Page:
+    def __init__(self, page_no):
+        self.page_no = page_no
+        self.image = None
+
+
+def _make_item(page_no, spec):
+    if spec["type"] == "section_header":
+        return SectionHeaderItem(page_no, spec["text"], spec.get("level", 1))
+    if spec["type"] == "picture":
+        return PictureItem(page_no, spec.get("caption"))
+    return TextItem(page_no, spec["text"])
+
+
+class DoclingDocument:
+    """
+    The pages of a fake PDF as converted by the stub DocumentConverter.
+    """
+    def __init__(self, name, pages):
+        self.name = name
+        self.pages = {page_no: _Page(page_no) for page_no in pages}
+        self.items = [(page_no, _make_item(page_no, spec)) for page_no, specs in pages.items() for spec in specs]
+
+    def iterate_items(self, page_no=None):
+        for item_page, item in self.items:
+            if page_no is None or item_page == page_no:
+                yield item, 1
+
+    def export_to_markdown(self, page_no=None):
+        parts = []
+        for item, _ in self.iterate_items(page_no):
+            if isinstance(item, SectionHeaderItem):
+                parts.append("#" * (item.level + 1) + " " + item.text)
+            elif isinstance(item, TextItem):
+                parts.append(item.text)
+            elif isinstance(item, PictureItem):
+                parts.append("<!-- image -->")
+        return "\n\n".join(parts)
+
+    def export_to_html(self, page_no=None):
+        body = "".join(f"<p>{item.text}</p>" for item, _ in self.iterate_items(page_no) if isinstance(item, TextItem))
+        return f"<html><body>{body}</body></html>"
+
+
+# --- docling ------------------------------------------------------------------------------------------
+
+class InputFormat:
+    PDF = "pdf"
+
+
+class PdfPipelineOptions:
+    def __init__(self):
+        self.do_ocr = True
+        self.images_scale = 1.0
+        self.generate_page_images = False
+        self.generate_picture_images = False
+
+
+class PdfFormatOption:
+    def __init__(self, pipeline_options=None):
+        self.pipeline_options = pipeline_options
+
+
+class ConversionResult:
+    def __init__(self, document):
+        self.document = document
+
+
+class DocumentConverter:
+    """
+    Converts fake PDFs. Every call is appended to the file named by STUB_DOCLING_LOG as
+    "<pid> <file name> <first>-<last> <ocr|text>", then takes STUB_DOCLING_DELAY seconds.
+    """
+    def __init__(self, format_options=None):
+        self.pipeline_options = format_options[InputFormat.PDF].pipeline_options
+
+    def convert(self, source, page_range=None):
+        pdf = read_pdf(source)
+        if pdf.get("error"):
+            raise RuntimeError(pdf["error"])
+        first, last = page_range or (1, len(pdf["pages"]))
+        log_path = os.environ.get("STUB_DOCLING_LOG")
+        if log_path:
+            mode = "ocr" if self.pipeline_options.do_ocr else "text"
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(f"{os.getpid()} {Path(source).name} {first}-{last} {mode}\n")
+        time.sleep(float(os.environ.get("STUB_DOCLING_DELAY", "0")))
+        pages = {page_no: pdf["pages"][page_no - 1]["items"] for page_no in range(first, last + 1)}
+        return ConversionResult(DoclingDocument(Path(source).stem, pages))
+
+
+# --- pypdfium2 ----------------------------------------------------------------------------------------
+
+FPDF_PAGEOBJ_IMAGE = 3
+
+
+class PdfiumError(Exception):
+    pass
+
+
+class _PdfObject:
+    def __init__(self, pos):
+        self.pos = pos
+
+    def get_pos(self):
+        return self.pos
+
+
+class _PdfTextPage:
+    def __init__(self, text):
+        self.text = text
+
+    def get_text_range(self):
+        return self.text
+
+    def close(self):
+        pass
+
+
+class _PdfPage:
+    def __init__(self, spec):
+        self.spec = spec
+
+    def get_textpage(self):
+        default = " ".join(item.get("text", "") for item in self.spec["items"])
+        return _PdfTextPage(self.spec.get("text_layer", default))
+
+    def get_size(self):
+        return PAGE_SIZE
+
+    def get_objects(self, filter=None, max_depth=2):
+        coverage = self.spec.get("image_coverage", 0.0)
+        if coverage and (filter is None or FPDF_PAGEOBJ_IMAGE in filter):
+            width, height = PAGE_SIZE
+            yield _PdfObject((0.0, 0.0, width, height * coverage))
+
+    def close(self):
+        pass
+
+
+class PdfDocument:
+    def __init__(self, path):
+        try:
+            self.pages = read_pdf(path)["pages"]
+        except (OSError, ValueError) as e:
+            raise PdfiumError(str(e))
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, index):
+        return _PdfPage(self.pages[index])
+
+    def close(self):
+        pass
+
+
+# --- installation -------------------------------------------------------------------------------------
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install_stubs():
+    """
+    Registers the stubs as docling, docling_core, pypdfium2 and bs4.
+    """
+    _module("docling")
+    _module("docling.document_converter", DocumentConverter=DocumentConverter, PdfFormatOption=PdfFormatOption)
+    _module("docling.datamodel")
+    _module("docling.datamodel.base_models", InputFormat=InputFormat)
+    _module("docling.datamodel.pipeline_options", PdfPipelineOptions=PdfPipelineOptions)
+    _module("docling_core")
+    _module("docling_core.types")
+    _module("docling_core.types.doc", DocItem=DocItem, TextItem=TextItem, SectionHeaderItem=SectionHeaderItem,
+            FloatingItem=FloatingItem, TableItem=TableItem, PictureItem=PictureItem, ImageRefMode=ImageRefMode,
+            DoclingDocument=DoclingDocument)
+    _module("pypdfium2", PdfDocument=PdfDocument, PdfiumError=PdfiumError,
+            raw=_module("pypdfium2.raw", FPDF_PAGEOBJ_IMAGE=FPDF_PAGEOBJ_IMAGE))
+    _module("bs4", BeautifulSoup=object)
+
+
+def load_package():
+    """
+    Registers the repository as the package without running its __init__.py, which imports the
+    installed package layout, so that the modules' relative imports resolve.
+    """
+    if PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_loader(PACKAGE, loader=None, is_package=True)
+        package = importlib.util.module_from_spec(spec)
+        package.__path__ = [str(REPO_DIR)]
+        sys.modules[PACKAGE] = package
+    return sys.modules[PACKAGE]
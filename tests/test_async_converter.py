@@ -0,0 +1,53 @@
+"""
+The asyncio API on the stubbed docling.
+"""
+import asyncio
+import time
+
+from docling_page_wise_pdf_converter.async_converter import AsyncPdfConverter
+from support import text_page, write_pdf
+
+BODY = "A born-digital page with enough characters in its text layer to count as page"
+
+
+def scanned_page(text):
+    return text_page(text, text_layer="", image_coverage=1.0)
+
+
+def test_iter_pages_yields_pages_before_the_conversion_finishes(tmp_path, conversions, monkeypatch):
+    monkeypatch.setenv("STUB_DOCLING_DELAY", "0.5")
+    pages = [text_page(f"{BODY} {n}") for n in range(1, 6)] + [scanned_page(f"Scan {n}") for n in range(6, 11)]
+    source = write_pdf(tmp_path / "doc.pdf", pages)
+    output_dir = tmp_path / "output"
+
+    async def collect():
+        items, times = [], []
+        async with AsyncPdfConverter() as converter:
+            async for item in converter.iter_pages(source, str(output_dir), "markdown"):
+                items.append(item)
+                times.append(time.monotonic())
+        return items, times
+
+    start = time.monotonic()
+    items, times = asyncio.run(collect())
+
+    # The first route's pages arrive while docling converts the second one
+    assert times[0] - start < 0.9 and times[-1] - start >= 1.0
+    assert [page for _, page, _ in items] == list(range(1, 11))
+    assert len(conversions()) == 2
+
+
+def test_cancelled_conversion_stops(tmp_path, conversions, monkeypatch):
+    monkeypatch.setenv("STUB_DOCLING_DELAY", "0.3")
+    pages = [text_page(f"{BODY} {n}") if n % 10 < 5 else scanned_page(f"Scan {n}") for n in range(1, 41)]
+    source = write_pdf(tmp_path / "doc.pdf", pages)
+
+    async def cancel_after_first_page():
+        async with AsyncPdfConverter() as converter:
+            async for _ in converter.iter_pages(source, str(tmp_path / "output"), "markdown"):
+                break
+
+    asyncio.run(cancel_after_first_page())
+
+    assert len(conversions()) <= 2
+    assert not (tmp_path / "output" / "doc.markdown.json").exists()
@@ -0,0 +1,65 @@
+"""
+Resuming convert_batch from its journal.
+"""
+import json
+import shutil
+
+from docling_page_wise_pdf_converter.batch_journal import BatchJournal
+from docling_page_wise_pdf_converter.content_manager import ContentManager
+from docling_page_wise_pdf_converter.pdf_converter import convert_batch
+from support import text_page, write_pdf
+
+
+def test_journal_ignores_truncated_tail_and_keeps_appending(tmp_path):
+    journal_path = tmp_path / "journal.jsonl"
+    journal = BatchJournal(journal_path)
+    journal.record_unit("a.pdf", "markdown", [2, 1], "abc")
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"event": "unit", "document": "b.pdf", "form')
+
+    journal = BatchJournal(journal_path)
+    assert journal.get_unit("a.pdf", "markdown")["pages"] == [1, 2]
+    assert journal.get_unit("b.pdf", "markdown") is None
+    journal.record_unit("b.pdf", "markdown", [1], "def")
+
+    journal = BatchJournal(journal_path)
+    assert journal.is_unit_complete("a.pdf", "markdown", "abc")
+    assert journal.is_unit_complete("b.pdf", "markdown", "def")
+    assert not journal.is_unit_complete("b.pdf", "markdown", "changed")
+
+
+def test_resume_converts_only_units_missing_from_journal(tmp_path, conversions):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page("One"), text_page("Two")])
+    output_dir = tmp_path / "output"
+    convert_batch([source], str(output_dir), "all")
+    assert len(conversions()) == 1
+
+    convert_batch([source], str(output_dir), "all")
+    assert len(conversions()) == 1
+
+    # A crash while journaling the last unit leaves a cut-off line
+    journal_path = output_dir / ".batch_journal.jsonl"
+    lines = journal_path.read_text().splitlines(keepends=True)
+    last_format = json.loads(lines[-1])["format"]
+    journal_path.write_text("".join(lines[:-1]) + lines[-1][:20])
+    ContentManager(output_dir).discard_content("doc", last_format)
+
+    convert_batch([source], str(output_dir), "all")
+    assert len(conversions()) == 2
+    assert BatchJournal(journal_path).get_unit(str(tmp_path / "doc.pdf"), last_format)["pages"] == [1, 2]
+    assert ContentManager(output_dir).load_content("doc", last_format).keys() == {1, 2}
+
+
+def test_resume_reconverts_unit_whose_shared_pages_are_missing(tmp_path, conversions):
+    sources = [write_pdf(tmp_path / f"{name}.pdf", [text_page("Boilerplate"), text_page(name)]) for name in "ab"]
+    output_dir = tmp_path / "output"
+    convert_batch(sources, str(output_dir), "markdown")
+    assert any("ref" in entry for entry in json.loads((output_dir / "b.markdown.json").read_text()))
+
+    shutil.rmtree(output_dir / ".page_cache")
+    convert_batch(sources, str(output_dir), "markdown")
+
+    assert len(conversions()) == 4
+    content_manager = ContentManager(output_dir)
+    assert content_manager.load_content("b", "markdown") == {1: "Boilerplate", 2: "b"}
+    assert content_manager.verify_content("b", "markdown", [1, 2])
@@ -0,0 +1,73 @@
+"""
+Scheduled batches: splitting large documents into page ranges and merging them back.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from docling_page_wise_pdf_converter import batch_scheduler
+from docling_page_wise_pdf_converter.batch_journal import BatchJournal
+from docling_page_wise_pdf_converter.content_manager import ContentManager
+from docling_page_wise_pdf_converter.pdf_converter import PdfConverter
+from support import text_page, write_pdf
+
+BOILERPLATE = text_page("Terms and conditions apply to every document in this batch.")
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch):
+    # Worker threads instead of processes, so the jobs see the stubbed docling on every platform
+    monkeypatch.setattr(batch_scheduler, "ProcessPoolExecutor", ThreadPoolExecutor)
+    large = write_pdf(tmp_path / "large.pdf", [text_page(f"Large page {n}") for n in range(1, 8)] + [BOILERPLATE])
+    small = write_pdf(tmp_path / "small.pdf", [BOILERPLATE])
+    return tmp_path, [large, small]
+
+
+def run(tmp_path, sources, output_format="all"):
+    return batch_scheduler.run_scheduled_batch(sources, str(tmp_path / "output"), output_format, workers=2,
+                                               min_split_pages=2)
+
+
+def test_large_document_is_split_and_merged_with_its_references(batch, conversions):
+    tmp_path, sources = batch
+
+    report = run(tmp_path, sources)
+
+    assert report["jobs"] == 3
+    assert sorted(pages for name, pages, _ in conversions() if name == "large.pdf") == ["1-4", "5-8"]
+    output_dir = tmp_path / "output"
+    content_manager = ContentManager(output_dir)
+    markdown = content_manager.load_content("large", "markdown")
+    assert list(markdown) == list(range(1, 9)) and markdown[8] == BOILERPLATE["items"][0]["text"]
+    PdfConverter(sources[0], str(tmp_path / "unsplit"), dedup_pages=False).convert_all()
+    for format_name in ("markdown", "txt", "json", "xml"):
+        entries = json.loads((output_dir / f"large.{format_name}.json").read_text())
+        assert [entry["page"] for entry in entries] == list(range(1, 9))
+        assert all("ref" in entry for entry in entries)
+        expected = ContentManager(tmp_path / "unsplit").load_content("large", format_name)
+        assert content_manager.load_content("large", format_name) == expected
+    assert not list(output_dir.glob("large.pages*"))
+    journal = BatchJournal(output_dir / ".batch_journal.jsonl")
+    assert journal.get_unit(sources[0], "csv")["pages"] == list(range(1, 9))
+    assert (output_dir / "large.md").read_text().index("## Page 4") < (output_dir / "large.md").read_text().index("## Page 5")
+
+    converted = len(conversions())
+    run(tmp_path, sources)
+    assert len(conversions()) == converted
+
+
+def test_stale_parts_are_discarded_and_matching_parts_reused(batch, conversions):
+    tmp_path, sources = batch
+    output_dir = tmp_path / "output"
+    # Parts left by interrupted runs: one at the bounds the new plan picks, others at different bounds
+    PdfConverter(sources[0], str(output_dir), page_range=(1, 4)).convert_to_format("markdown")
+    PdfConverter(sources[0], str(output_dir), page_range=(1, 3)).convert_to_format("markdown")
+    PdfConverter(sources[0], str(output_dir), page_range=(4, 8)).convert_to_format("txt")
+
+    run(tmp_path, sources, "markdown")
+
+    large_conversions = [pages for name, pages, _ in conversions() if name == "large.pdf"]
+    assert large_conversions == ["1-4", "1-3", "4-8", "5-8"]
+    assert not list(output_dir.glob("large.pages*"))
+    assert list(ContentManager(output_dir).load_content("large", "markdown")) == list(range(1, 9))
@@ -0,0 +1,77 @@
+"""
+Retrieval chunk index: offsets, page spans and incremental rebuilds.
+"""
+from docling_page_wise_pdf_converter.chunker import PAGE_SEPARATOR, build_chunk_index, join_pages, update_chunk_index
+from docling_page_wise_pdf_converter.content_manager import ContentManager
+from docling_page_wise_pdf_converter.pdf_converter import PdfConverter
+from support import write_pdf
+
+PAGES = {
+    1: "# Introduction\n\nThe first paragraph of the introduction.\n\nA second paragraph.",
+    2: "It continues on the second page.\n\n## Results\n\n| a | b |\n|---|---|\n| 1 | 2 |\n| 3 | 4 |",
+    3: "## Discussion\n\n" + " ".join(f"Sentence number {n} ends here." for n in range(1, 13)),
+}
+
+
+def assert_consistent(index, page_contents):
+    text, page_spans = join_pages(page_contents)
+    for chunk in index["chunks"]:
+        assert text[chunk["start"]:chunk["end"]] == chunk["text"]
+        pages = [page for page, (start, end) in page_spans.items() if start < chunk["end"] and chunk["start"] < end]
+        assert (chunk["page_start"], chunk["page_end"]) == (pages[0], pages[-1])
+    for page, (start, end) in page_spans.items():
+        assert text[start:end] == page_contents[page]
+
+
+def test_chunks_keep_sections_and_tables_and_record_offsets_and_pages():
+    index = build_chunk_index(PAGES, "doc", max_tokens=20)
+
+    assert_consistent(index, PAGES)
+    assert index["separator"] == PAGE_SEPARATOR
+    assert all(chunk["tokens"] <= 20 for chunk in index["chunks"])
+    headings = [chunk["heading"] for chunk in index["chunks"]]
+    assert headings[0] == "Introduction" and "Results" in headings and headings[-1] == "Discussion"
+    spanning = [chunk for chunk in index["chunks"] if chunk["page_start"] != chunk["page_end"]]
+    assert spanning and all(chunk["heading"] == "Introduction" for chunk in spanning)
+    table = [chunk for chunk in index["chunks"] if "| a | b |" in chunk["text"]]
+    assert len(table) == 1 and "| 3 | 4 |" in table[0]["text"]
+    discussion = [chunk for chunk in index["chunks"] if chunk["heading"] == "Discussion"]
+    assert len(discussion) > 1 and all(chunk["text"].rstrip().endswith(".") for chunk in discussion)
+
+
+def test_oversized_table_is_split_between_rows():
+    table = "| a | b |\n|---|---|\n" + "\n".join(f"| {n} | {n * 2} |" for n in range(30))
+    index = build_chunk_index({1: table}, "doc", max_tokens=25)
+
+    assert_consistent(index, {1: table})
+    assert len(index["chunks"]) > 1
+    assert all(chunk["text"].startswith("|") and chunk["text"].endswith("|") for chunk in index["chunks"])
+
+
+def test_rebuild_reuses_unchanged_sections_with_shifted_offsets():
+    previous = build_chunk_index(PAGES, "doc", max_tokens=20)
+    changed = {**PAGES, 1: PAGES[1].replace("A second paragraph.", "A longer second paragraph, now edited.")}
+
+    index = build_chunk_index(changed, "doc", max_tokens=20, previous=previous)
+
+    assert_consistent(index, changed)
+    assert index["reused_sections"] == 2
+    assert [chunk["text"] for chunk in index["chunks"]] == [chunk["text"] for chunk in build_chunk_index(changed, "doc", 20)["chunks"]]
+
+
+def test_chunk_index_is_saved_with_markdown_and_rebuilt_on_change(tmp_path):
+    source = write_pdf(tmp_path / "doc.pdf", [
+        {"items": [{"type": "section_header", "text": "Title", "level": 1}, {"type": "text", "text": "Body text."}]},
+        {"items": [{"type": "text", "text": "More body text on the second page."}]},
+    ])
+    PdfConverter(source, str(tmp_path / "output"), chunk_max_tokens=50).convert_to_format("markdown")
+    content_manager = ContentManager(tmp_path / "output")
+
+    index = content_manager.load_chunk_index("doc")
+    assert [(chunk["page_start"], chunk["page_end"]) for chunk in index["chunks"]] == [(1, 2)]
+    assert_consistent(index, content_manager.load_content("doc", "markdown"))
+    assert update_chunk_index(content_manager, "doc", max_tokens=50) == index
+
+    rebuilt = update_chunk_index(content_manager, "doc", {1: "# Title\n\nBody text.", 2: "Replaced."}, max_tokens=50)
+    assert rebuilt["chunks"][0]["text"].endswith("Replaced.")
+    assert content_manager.load_chunk_index("doc") == rebuilt
@@ -0,0 +1,43 @@
+"""
+Page deduplication through the shared page cache.
+"""
+import json
+
+import pytest
+
+from docling_page_wise_pdf_converter.content_manager import ContentManager
+from docling_page_wise_pdf_converter.page_dedup import page_fingerprint
+from docling_page_wise_pdf_converter.pdf_converter import SUPPORTED_FORMATS, PdfConverter
+from support import DoclingDocument, text_page, write_pdf
+
+BOILERPLATE = {"items": [{"type": "section_header", "text": "Terms and conditions", "level": 1},
+                         {"type": "text", "text": "All rights reserved."},
+                         {"type": "picture", "caption": "Company logo"}]}
+
+
+def test_fingerprint_ignores_page_number_but_not_content():
+    doc = DoclingDocument("doc", {1: BOILERPLATE["items"], 2: BOILERPLATE["items"],
+                                  3: BOILERPLATE["items"][:2] + [{"type": "picture", "caption": "Other logo"}],
+                                  4: [{"type": "section_header", "text": "Terms and conditions", "level": 2}]
+                                     + BOILERPLATE["items"][1:]})
+
+    assert page_fingerprint(doc, 1) == page_fingerprint(doc, 2)
+    assert page_fingerprint(doc, 1) != page_fingerprint(doc, 3)
+    assert page_fingerprint(doc, 1) != page_fingerprint(doc, 4)
+
+
+@pytest.mark.parametrize("format_name", SUPPORTED_FORMATS)
+def test_page_cached_for_another_page_number_is_referenced_and_relabelled(tmp_path, format_name):
+    first = write_pdf(tmp_path / "first.pdf", [BOILERPLATE, text_page("First")])
+    second = write_pdf(tmp_path / "second.pdf", [text_page("Second"), text_page("More"), BOILERPLATE])
+    PdfConverter(first, str(tmp_path / "output")).convert_to_format(format_name)
+
+    converter = PdfConverter(second, str(tmp_path / "output"))
+    converter.convert_to_format(format_name)
+    PdfConverter(second, str(tmp_path / "inline"), dedup_pages=False).convert_to_format(format_name)
+
+    assert converter.dedup_stats[format_name] == 1
+    entries = json.loads((tmp_path / "output" / f"second.{format_name}.json").read_text())
+    assert all("ref" in entry and "content" not in entry for entry in entries)
+    expected = ContentManager(tmp_path / "inline").load_content("second", format_name)
+    assert ContentManager(tmp_path / "output").load_content("second", format_name) == expected
@@ -0,0 +1,50 @@
+"""
+Pre-scan classification of pages and planning of OCR routes.
+"""
+from docling_page_wise_pdf_converter.page_scanner import PageRoute, count_pages, plan_page_routes, scan_text_layer
+from support import text_page, write_pdf
+
+BODY = "A born-digital page with enough characters in its text layer to count."
+BATES = "CONFIDENTIAL - SUBJECT TO PROTECTIVE ORDER - BATES ABC-0000123"
+
+
+def test_scan_requires_text_layer_and_low_image_coverage(tmp_path):
+    pdf_path = write_pdf(tmp_path / "doc.pdf", [
+        text_page(BODY),
+        text_page(BODY, image_coverage=0.3),
+        text_page("Scanned body", text_layer=BATES, image_coverage=1.0),
+        text_page("Scanned body", text_layer=""),
+        text_page("Garbled", text_layer="�" * 60),
+        text_page("Short"),
+    ])
+
+    assert scan_text_layer(pdf_path) == {1: True, 2: True, 3: False, 4: False, 5: False, 6: False}
+    assert scan_text_layer(pdf_path, page_range=(2, 3)) == {2: True, 3: False}
+    assert scan_text_layer(pdf_path, max_image_coverage=0.2)[2] is False
+    assert count_pages(pdf_path) == 6
+
+
+def test_scan_of_unreadable_file_returns_none(tmp_path):
+    (tmp_path / "broken.pdf").write_text("not a pdf")
+
+    assert scan_text_layer(tmp_path / "broken.pdf") is None
+    assert count_pages(tmp_path / "broken.pdf") is None
+
+
+def classify(pattern):
+    return {page_no: c == "t" for page_no, c in enumerate(pattern, start=1)}
+
+
+def test_routes_group_consecutive_pages():
+    assert plan_page_routes(classify("tttttttt")) == [PageRoute(1, 8, False)]
+    assert plan_page_routes(classify("ooo")) == [PageRoute(1, 3, True)]
+    assert plan_page_routes(classify("tttttoottttt")) == [
+        PageRoute(1, 5, False), PageRoute(6, 7, True), PageRoute(8, 12, False)]
+
+
+def test_short_text_runs_are_folded_into_neighbouring_ocr_routes():
+    assert plan_page_routes(classify("tototototo")) == [PageRoute(1, 10, True)]
+    assert plan_page_routes(classify("tttttttoott")) == [PageRoute(1, 7, False), PageRoute(8, 11, True)]
+    assert plan_page_routes(classify("tottt"), min_text_pages=3) == [PageRoute(1, 2, True), PageRoute(3, 5, False)]
+    assert plan_page_routes(classify("tot"), min_text_pages=1) == [
+        PageRoute(1, 1, False), PageRoute(2, 2, True), PageRoute(3, 3, False)]
@@ -0,0 +1,139 @@
+"""
+PdfConverter on the stubbed docling: OCR routing and the merged output.
+"""
+import threading
+
+import pytest
+
+from docling_page_wise_pdf_converter.content_manager import ContentManager
+from docling_page_wise_pdf_converter.format_converters.base_converter import BaseConverter
+from docling_page_wise_pdf_converter.format_converters.markdown_converter import MarkdownConverter
+from docling_page_wise_pdf_converter.pdf_converter import PdfConverter
+from support import text_page, write_pdf
+
+BODY = "A born-digital page with enough characters in its text layer to count as page"
+
+
+def scanned_page(text):
+    return text_page(text, text_layer="BATES ABC-0000123 " * 4, image_coverage=1.0)
+
+
+class RecordingMarkdownConverter(MarkdownConverter):
+    def save_with_original_extension(self, page_contents, pdf_path, output_dir, doc):
+        self.saved_doc = doc
+        super().save_with_original_extension(page_contents, pdf_path, output_dir, doc)
+
+
+def convert_markdown(source, output_dir, **kwargs):
+    converter = PdfConverter(source, str(output_dir), **kwargs)
+    converter.format_converters["markdown"] = RecordingMarkdownConverter()
+    converter.convert_to_format("markdown")
+    return converter
+
+
+def test_routes_are_converted_separately_and_merged_in_page_order(tmp_path, conversions):
+    pages = [text_page(f"{BODY} {n}") for n in range(1, 7)] + [scanned_page("Scan 7"), scanned_page("Scan 8")]
+    pages += [text_page(f"{BODY} {n}") for n in range(9, 15)]
+    source = write_pdf(tmp_path / "doc.pdf", pages)
+
+    converter = convert_markdown(source, tmp_path / "output")
+
+    assert conversions() == [("doc.pdf", "1-6", "text"), ("doc.pdf", "7-8", "ocr"), ("doc.pdf", "9-14", "text")]
+    content = ContentManager(tmp_path / "output").load_content("doc", "markdown")
+    assert list(content) == list(range(1, 15))
+    assert content[7] == "Scan 7" and content[14] == f"{BODY} 14"
+    markdown = (tmp_path / "output" / "doc.md").read_text()
+    assert markdown.index("## Page 6") < markdown.index("Scan 7") < markdown.index("## Page 9")
+    assert converter.format_converters["markdown"].saved_doc is None
+
+
+def test_alternating_pages_are_converted_in_one_ocr_call(tmp_path, conversions):
+    pages = [text_page(f"{BODY} {n}") if n % 2 else scanned_page(f"Scan {n}") for n in range(1, 9)]
+    source = write_pdf(tmp_path / "doc.pdf", pages)
+
+    convert_markdown(source, tmp_path / "output")
+
+    assert conversions() == [("doc.pdf", "1-8", "ocr")]
+
+
+def test_unrouted_conversion_passes_whole_document(tmp_path, conversions):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page(f"{BODY} {n}") for n in range(1, 4)])
+
+    converter = convert_markdown(source, tmp_path / "output", ocr_routing=False)
+
+    assert conversions() == [("doc.pdf", "1-3", "ocr")]
+    assert list(converter.format_converters["markdown"].saved_doc.pages) == [1, 2, 3]
+
+
+
+class WholeDocumentConverter(BaseConverter):
+    """
+    A converter written against the whole-document API.
+    """
+    calls = 0
+
+    def convert_to_format(self, doc, filename, output_dir):
+        WholeDocumentConverter.calls += 1
+        return {page_number: doc.export_to_markdown(page_no=page_number).upper() for page_number in doc.pages}
+
+
+@pytest.mark.parametrize("dedup_pages", [True, False])
+def test_converter_overriding_convert_to_format_is_used(tmp_path, dedup_pages):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page(f"{BODY} {n}") for n in range(1, 4)])
+    WholeDocumentConverter.calls = 0
+
+    converter = PdfConverter(source, str(tmp_path / "output"), dedup_pages=dedup_pages)
+    converter.format_converters["upper"] = WholeDocumentConverter()
+    converter.convert_to_format("upper")
+
+    assert WholeDocumentConverter.calls == 1
+    content = ContentManager(tmp_path / "output").load_content("doc", "upper")
+    assert content == {n: f"{BODY} {n}".upper() for n in range(1, 4)}
+
+
+def test_converter_without_conversion_method_fails(tmp_path):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page(BODY)])
+    converter = PdfConverter(source, str(tmp_path / "output"))
+    converter.format_converters["none"] = BaseConverter()
+
+    with pytest.raises(NotImplementedError):
+        converter.convert_to_format("none")
+
+
+def test_pages_are_reported_as_each_docling_call_finishes(tmp_path, conversions):
+    pages = [text_page(f"{BODY} {n}") for n in range(1, 7)] + [scanned_page("Scan 7"), scanned_page("Scan 8")]
+    source = write_pdf(tmp_path / "doc.pdf", pages)
+    reported = []
+
+    converter = PdfConverter(source, str(tmp_path / "output"),
+                             on_page=lambda format_name, page, _: reported.append((format_name, page, len(conversions()))))
+    assert conversions() == []
+    converter.convert_formats(["markdown", "txt"])
+
+    assert reported == ([("markdown", n, 1) for n in range(1, 7)] + [("txt", n, 1) for n in range(1, 7)]
+                        + [("markdown", n, 2) for n in (7, 8)] + [("txt", n, 2) for n in (7, 8)])
+
+
+def test_saved_formats_are_not_converted_again(tmp_path, conversions):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page(f"{BODY} {n}") for n in range(1, 4)])
+    PdfConverter(source, str(tmp_path / "output")).convert_to_format("markdown")
+    reported = []
+
+    converter = PdfConverter(source, str(tmp_path / "output"), on_page=lambda *page: reported.append(page))
+    converter.convert_to_format("markdown")
+
+    assert len(conversions()) == 1
+    assert [page for _, page, _ in reported] == [1, 2, 3]
+    assert converter._expected_pages() == [1, 2, 3]
+
+
+def test_pages_are_batched_only_when_requested(tmp_path, conversions):
+    source = write_pdf(tmp_path / "doc.pdf", [text_page(f"{BODY} {n}") for n in range(1, 8)])
+
+    PdfConverter(source, str(tmp_path / "single"), cancel_event=threading.Event()).convert_to_format("markdown")
+    assert conversions() == [("doc.pdf", "1-7", "text")]
+
+    PdfConverter(source, str(tmp_path / "batched"), batch_pages=3).convert_to_format("markdown")
+    assert conversions()[1:] == [("doc.pdf", "1-3", "text"), ("doc.pdf", "4-6", "text"), ("doc.pdf", "7-7", "text")]
+    assert (ContentManager(tmp_path / "batched").load_content("doc", "markdown")
+            == ContentManager(tmp_path / "single").load_content("doc", "markdown"))
@@ -0,0 +1,122 @@
+"""
+Runs several ShardWorker processes against one manifest with docling replaced by the stubs in support.py.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from support import text_page, write_pdf
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+# Runs one ShardWorker on the stubbed docling
+WORKER_SCRIPT = '''
+import sys
+
+import support
+
+support.install_stubs()
+support.load_package()
+
+from docling_page_wise_pdf_converter import sharded_batch
+
+manifest, output_dir, lease_timeout, heartbeat_interval = sys.argv[1:5]
+worker = sharded_batch.ShardWorker(manifest, output_dir, "markdown", lease_timeout=float(lease_timeout),
+                                   heartbeat_interval=float(heartbeat_interval), poll_interval=0.1, max_attempts=2)
+worker.run()
+'''
+
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    (tmp_path / "worker.py").write_text(WORKER_SCRIPT)
+    return tmp_path
+
+
+def start_worker(batch_dir, delay=0.2, lease_timeout=5.0, heartbeat_interval=0.5):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(TESTS_DIR), os.environ.get("PYTHONPATH", "")]),
+               STUB_DOCLING_LOG=str(batch_dir / "conversions.log"), STUB_DOCLING_DELAY=str(delay))
+    args = [sys.executable, str(batch_dir / "worker.py"), str(batch_dir / "manifest.json"), str(batch_dir / "output"),
+            str(lease_timeout), str(heartbeat_interval)]
+    return subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def write_manifest(batch_dir, sources):
+    for source in sources:
+        pages = [text_page(f"{source} page {page}") for page in range(1, 4)]
+        write_pdf(batch_dir / source, pages, error="cannot parse" if source.startswith("broken") else None)
+    (batch_dir / "manifest.json").write_text(json.dumps({"documents": [str(batch_dir / s) for s in sources]}))
+
+
+def read_log(batch_dir):
+    log_path = batch_dir / "conversions.log"
+    if not log_path.exists():
+        return []
+    return [line.split() for line in log_path.read_text().splitlines()]
+
+
+def wait_for(workers, timeout=60):
+    for worker in workers:
+        _, stderr = worker.communicate(timeout=timeout)
+        assert worker.returncode == 0, stderr.decode()
+
+
+def test_workers_convert_each_document_exactly_once(batch_dir):
+    sources = [f"doc{i}.pdf" for i in range(8)]
+    write_manifest(batch_dir, sources)
+
+    wait_for([start_worker(batch_dir) for _ in range(4)])
+
+    conversions = Counter((name, pages) for _, name, pages, _ in read_log(batch_dir))
+    assert sorted(name for name, _ in conversions) == sorted(sources)
+    assert set(conversions.values()) == {1}
+    assert len({pid for pid, *_ in read_log(batch_dir)}) > 1
+    lease_dir = batch_dir / "manifest.leases"
+    assert len(list(lease_dir.glob("*.done"))) == len(sources)
+    assert not list(lease_dir.glob("*.lease"))
+    for source in sources:
+        assert (batch_dir / "output" / f"{Path(source).stem}.md").exists()
+
+
+def test_lease_of_killed_worker_is_reclaimed_after_timeout(batch_dir):
+    write_manifest(batch_dir, ["doc.pdf"])
+    lease_timeout = 2.0
+
+    stalled = start_worker(batch_dir, delay=60, lease_timeout=lease_timeout)
+    deadline = time.time() + 30
+    while not read_log(batch_dir):
+        assert time.time() < deadline and stalled.poll() is None
+        time.sleep(0.05)
+    os.kill(stalled.pid, signal.SIGKILL)
+    stalled.wait()
+    killed_at = time.time()
+    assert list((batch_dir / "manifest.leases").glob("*.lease"))
+
+    wait_for([start_worker(batch_dir, lease_timeout=lease_timeout)])
+
+    log = read_log(batch_dir)
+    assert len(log) == 2 and log[0][0] == str(stalled.pid) and log[1][0] != str(stalled.pid)
+    done = list((batch_dir / "manifest.leases").glob("*.done"))
+    assert len(done) == 1
+    assert json.loads(done[0].read_text())["completed"] - killed_at >= lease_timeout - 1.0
+    assert (batch_dir / "output" / "doc.md").exists()
+
+
+def test_failing_document_is_given_up_without_stopping_workers(batch_dir):
+    write_manifest(batch_dir, ["broken.pdf", "doc0.pdf", "doc1.pdf"])
+
+    wait_for([start_worker(batch_dir) for _ in range(2)])
+
+    lease_dir = batch_dir / "manifest.leases"
+    assert len(list(lease_dir.glob("*.done"))) == 2
+    failures = [json.loads(path.read_text()) for path in lease_dir.glob("*.failed")]
+    assert len(failures) == 1
+    assert failures[0]["attempts"] == 2
+    assert "cannot parse" in failures[0]["error"]